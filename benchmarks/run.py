@@ -0,0 +1,273 @@
+"""Micro-benchmarks for the overhead the framework itself adds.
+
+Runs against local stand-ins (see ``benchmarks/stand_ins.py``) and writes machine-readable JSON so runs
+can be compared across commits::
+
+    python -m benchmarks.run                        # All suites -> benchmarks/results/<commit>.json
+    python -m benchmarks.run --suites api,data      # Selected suites
+    python -m benchmarks.run --compare OLD.json NEW.json
+
+Suites: ``api`` (APIBase._request overhead, BookingService CRUD), ``web`` (WebBase waits and lookups against
+a local page in headless Chrome; skipped if no browser can start), ``data`` (payload generation) and
+``fixtures`` (config loading and client creation, as done by conftest.py).
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from selenium.webdriver.common.by import By
+
+from benchmarks.stand_ins import LocalServer, NullAdapter
+from src.utils.logger import configure_logging
+
+SUITES = ("api", "web", "data", "fixtures")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def measure(func, number: int, repeat: int) -> dict:
+    """Times `number` calls of `func`, `repeat` times. Returns per-call statistics in microseconds."""
+    func()  # Warm-up: lazy imports, connection pools
+    per_call = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - started) / number * 1e6)
+    return {
+        "median_us": round(statistics.median(per_call), 3),
+        "min_us": round(min(per_call), 3),
+        "mean_us": round(statistics.mean(per_call), 3),
+        "stdev_us": round(statistics.stdev(per_call), 3) if repeat > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _client_config(base_url: str) -> dict:
+    return {
+        "base_api_url": base_url,
+        "base_web_url": base_url,
+        "api_auth_endpoint": "/auth",
+        "default_timeout": 10,
+        "credentials": {"api_user": {"username": "admin", "password": "password123"}},
+        # The rate limiter would dominate every timing; the rest of the resilience layer stays on
+        "resilience": {"rate_limit": {"enabled": False}},
+    }
+
+
+def _booking_payload() -> dict:
+    """Same shape as the payloads built in tests/api/test_booking_api.py."""
+    from src.utils.data_generator import fake
+
+    return {
+        "firstname": fake.first_name(),
+        "lastname": fake.last_name(),
+        "totalprice": fake.random_int(min=50, max=1000),
+        "depositpaid": fake.boolean(),
+        "bookingdates": {
+            "checkin": fake.date_between(start_date="-1y", end_date="today").strftime("%Y-%m-%d"),
+            "checkout": fake.date_between(start_date="today", end_date="+1y").strftime("%Y-%m-%d"),
+        },
+        "additionalneeds": "Breakfast",
+    }
+
+
+def bench_api(number: int, repeat: int) -> dict:
+    from src.api_clients.booking_service import BookingService
+    from src.base.api_base import APIBase
+
+    results = {}
+    null_url = "http://null.invalid"
+    client = APIBase(_client_config(null_url))
+    client.session.mount(null_url, NullAdapter())
+    results["requests.Session.request GET (null transport)"] = measure(
+        lambda: client.session.request("GET", f"{null_url}/booking/1", timeout=10), number, repeat
+    )
+    results["APIBase._request GET (null transport)"] = measure(
+        lambda: client.get("/booking/1"), number, repeat
+    )
+    client.auth_token = "benchmark-token"
+    results["APIBase._request PUT with auth (null transport)"] = measure(
+        lambda: client.put("/booking/1", json={"firstname": "Bench"}), number, repeat
+    )
+
+    with LocalServer() as server:
+        service = BookingService(_client_config(server.url))
+        service.authenticate()
+        payload = _booking_payload()
+        results["APIBase._request GET (local server)"] = measure(
+            lambda: service.health_check(), number, repeat
+        )
+
+        def crud_round_trip():
+            booking_id = service.create_booking(payload).json()["bookingid"]
+            service.get_booking_details(booking_id)
+            service.update_booking(booking_id, payload)
+            service.partial_update_booking(booking_id, {"firstname": "Bench"})
+            service.delete_booking(booking_id)
+
+        results["BookingService CRUD round trip (local server)"] = measure(
+            crud_round_trip, max(1, number // 5), repeat
+        )
+    return results
+
+
+def bench_web(number: int, repeat: int) -> dict:
+    from src.base.driver_factory import DriverFactory
+    from src.base.web_base import WebBase
+
+    results = {}
+    with LocalServer() as server:
+        started = time.perf_counter()
+        try:
+            driver = DriverFactory.get_driver("chrome", headless=True)
+        except Exception as e:
+            return {"skipped": f"Could not start headless Chrome: {e}"}
+        results["DriverFactory.get_driver chrome headless (one-off)"] = {
+            "median_us": round((time.perf_counter() - started) * 1e6, 3),
+            "number": 1,
+            "repeat": 1,
+        }
+        try:
+            page = WebBase(driver, _client_config(server.url))
+            number = max(1, number // 10)  # Every primitive is a WebDriver round trip
+            results["WebBase.navigate_to_url (with page metrics)"] = measure(
+                lambda: page.navigate_to_url("/page.html"), number, repeat
+            )
+            page.collect_metrics = False
+            results["WebBase.navigate_to_url (no page metrics)"] = measure(
+                lambda: page.navigate_to_url("/page.html"), number, repeat
+            )
+            results["WebBase._find_element"] = measure(
+                lambda: page._find_element((By.ID, "user-name")), number, repeat
+            )
+            results["WebBase._find_elements"] = measure(
+                lambda: page._find_elements((By.CLASS_NAME, "item")), number, repeat
+            )
+            results["WebBase._is_displayed"] = measure(
+                lambda: page._is_displayed((By.CLASS_NAME, "title")), number, repeat
+            )
+            results["WebBase._get_text"] = measure(
+                lambda: page._get_text((By.CLASS_NAME, "title")), number, repeat
+            )
+            results["WebBase._type"] = measure(
+                lambda: page._type((By.ID, "user-name"), "standard_user"), number, repeat
+            )
+            results["WebBase._click"] = measure(lambda: page._click((By.ID, "login-button")), number, repeat)
+            results["WebBase.wait_for_url_contains (already satisfied)"] = measure(
+                lambda: page.wait_for_url_contains("clicked"), number, repeat
+            )
+        finally:
+            driver.quit()
+    return results
+
+
+def bench_data(number: int, repeat: int) -> dict:
+    from src.utils.data_generator import generate_random_email, generate_random_string
+
+    return {
+        "data_generator.generate_random_string": measure(generate_random_string, number, repeat),
+        "data_generator.generate_random_email": measure(generate_random_email, number, repeat),
+        "booking payload (Faker)": measure(_booking_payload, number, repeat),
+    }
+
+
+def bench_fixtures(number: int, repeat: int) -> dict:
+    from conftest import build_config
+    from src.api_clients.booking_service import BookingService
+    from src.base.api_base import APIBase
+
+    config = build_config()
+    return {
+        "conftest.build_config": measure(build_config, number, repeat),
+        "APIBase(config)": measure(lambda: APIBase(config).session.close(), number, repeat),
+        "BookingService(config)": measure(lambda: BookingService(config).session.close(), number, repeat),
+    }
+
+
+BENCHMARKS = {"api": bench_api, "web": bench_web, "data": bench_data, "fixtures": bench_fixtures}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{'benchmark':<60} {'old us':>12} {'new us':>12} {'ratio':>8}")
+    for suite, results in new["results"].items():
+        for name, stats in results.items():
+            before = old["results"].get(suite, {}).get(name)
+            if not isinstance(stats, dict) or not isinstance(before, dict):
+                continue
+            ratio = stats["median_us"] / before["median_us"] if before["median_us"] else float("nan")
+            label = f"{suite}: {name}"
+            print(f"{label:<60} {before['median_us']:>12.1f} {stats['median_us']:>12.1f} {ratio:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Framework micro-benchmarks")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"Comma-separated subset of {SUITES}")
+    parser.add_argument("--number", type=int, default=200, help="Calls per timing repeat")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per benchmark")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suites: {sorted(unknown)}")
+
+    # Log calls still cost what they cost in a test run, but their output is discarded
+    configure_logging(stream=open(os.devnull, "w"))
+
+    commit = _git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "number": args.number,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for suite in suites:
+        print(f"Running {suite} benchmarks...")
+        report["results"][suite] = BENCHMARKS[suite](args.number, args.repeat)
+        for name, stats in report["results"][suite].items():
+            value = stats if isinstance(stats, str) else f"{stats['median_us']:>12.1f} us"
+            print(f"  {name:<58} {value}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
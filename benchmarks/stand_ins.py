@@ -0,0 +1,129 @@
+"""Local stand-ins for the services under test, so benchmarks measure the framework, not the network."""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import BaseAdapter
+
+BENCH_PAGE = b"""<!DOCTYPE html>
+<html>
+<head><title>Benchmark page</title></head>
+<body>
+  <span class="title">Products</span>
+  <input id="user-name" type="text">
+  <button id="login-button" onclick="location.hash = 'clicked'">Login</button>
+  <ul>
+    <li class="item">One</li><li class="item">Two</li><li class="item">Three</li>
+  </ul>
+</body>
+</html>
+"""
+
+
+class BookingHandler(BaseHTTPRequestHandler):
+    """Minimal in-memory imitation of the Restful-booker endpoints used by BookingService."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real service behind its load balancer
+    disable_nagle_algorithm = True  # Headers and body are separate writes; avoid delayed-ACK stalls
+    bookings = {}
+    next_id = [1]
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _send(self, status, payload=None, content_type="application/json"):
+        if isinstance(payload, bytes):
+            body = payload
+        elif isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain"
+        else:
+            body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _booking_id(self):
+        match = re.fullmatch(r"/booking/(\d+)", self.path)
+        return int(match.group(1)) if match else None
+
+    def do_GET(self):
+        if self.path == "/page.html":
+            return self._send(200, BENCH_PAGE, "text/html")
+        if self.path == "/ping":  # BookingService.health_check
+            return self._send(201, "Created")
+        if self.path.startswith("/booking") and self._booking_id() is None:
+            return self._send(200, [{"bookingid": i} for i in self.bookings])
+        booking = self.bookings.get(self._booking_id())
+        return self._send(200, booking) if booking else self._send(404, "Not Found")
+
+    def do_POST(self):
+        body = self._body()
+        if self.path == "/auth":
+            return self._send(200, {"token": "benchmark-token"})
+        with self.lock:
+            booking_id = self.next_id[0]
+            self.next_id[0] += 1
+            self.bookings[booking_id] = body
+        return self._send(200, {"bookingid": booking_id, "booking": body})
+
+    def do_PUT(self):
+        booking_id = self._booking_id()
+        self.bookings[booking_id] = self._body()
+        return self._send(200, self.bookings[booking_id])
+
+    def do_PATCH(self):
+        booking_id = self._booking_id()
+        self.bookings.setdefault(booking_id, {}).update(self._body())
+        return self._send(200, self.bookings[booking_id])
+
+    def do_DELETE(self):
+        self.bookings.pop(self._booking_id(), None)
+        return self._send(201, "Created")
+
+
+class LocalServer:
+    """Serves BookingHandler on an ephemeral localhost port in a background thread."""
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), BookingHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class NullAdapter(BaseAdapter):
+    """Transport adapter that answers every request with a canned response and never touches a socket."""
+
+    def __init__(self, status_code=200, body=b'{"bookingid": 1, "booking": {}}'):
+        super().__init__()
+        self.status_code = status_code
+        self.body = body
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response._content = self.body
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        return response
+
+    def close(self):
+        pass
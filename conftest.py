@@ -9,6 +9,16 @@ from src.utils.logger import get_logger  # Assuming you have a logger utility
 
 logger = get_logger(__name__)
 
+pytest_plugins = [
+    "src.plugins.log_context",
+    "src.plugins.scheduler",
+    "src.plugins.resilience_report",
+    "src.plugins.failure_artifacts",
+    "src.plugins.page_budget",
+    "src.plugins.perf_budget",
+    "src.plugins.soak",
+]
+
 # Load .env file from the config directory
 dotenv_path = os.path.join(os.path.dirname(__file__), "config", ".env")
 if os.path.exists(dotenv_path):
@@ -31,8 +41,7 @@ def load_config_file(config_path):
         return {}
 
 
-@pytest.fixture(scope="session")
-def config():
+def build_config():
     env = os.getenv("TEST_ENV", "dev")  # Default to 'dev' if not set
     base_config_path = os.path.join("config", "config.json")
     env_config_path = os.path.join("config", f"config_{env}.json")
@@ -57,16 +66,27 @@ def config():
     return cfg
 
 
+@pytest.fixture(scope="session")
+def config():
+    return build_config()
+
+
 @pytest.fixture(scope="function")
-def web_driver(config):
+def web_driver(config, request):
+    from src.plugins.failure_artifacts import CONFIG_STASH, WEB_DRIVER_STASH
+
     browser_name = config.get("browser", "chrome")  # Default to chrome if not specified
     headless_mode = config.get("headless", False)
     logger.info(f"Initializing WebDriver: {browser_name}, Headless: {headless_mode}")
     try:
         driver = DriverFactory.get_driver(browser_name, headless_mode)
+        # For failure artifacts: funcargs is incomplete when a fixture using the driver fails in setup
+        request.node.stash[WEB_DRIVER_STASH] = driver
+        request.node.stash[CONFIG_STASH] = config
         driver.maximize_window()
         yield driver
         logger.info("Quitting WebDriver.")
+        del request.node.stash[WEB_DRIVER_STASH]
         driver.quit()
     except Exception as e:
         logger.error(f"Error during WebDriver setup or teardown: {e}")
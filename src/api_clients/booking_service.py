@@ -3,6 +3,7 @@ from requests import Response
 
 from src.base.api_base import APIBase
 from src.utils.logger import get_logger
+from src.utils.perf import timed
 
 logger = get_logger(__name__)
 
@@ -16,19 +17,23 @@ class BookingService(APIBase):
     # def get_auth_token(self):
     #    return self.authenticate() # Calls APIBase.authenticate()
 
+    @timed()
     def create_booking(self, booking_data: dict) -> Response:
         logger.info(f"Creating booking with data: {booking_data.get('firstname', 'N/A')}")
         # POST /booking does not require prior auth token for Restful-booker
         return self.post(self.booking_endpoint, json=booking_data, requires_auth=False)
 
+    @timed()
     def get_booking_ids(self, filter_params: dict = None) -> Response:
         logger.info(f"Requesting all booking IDs with params: {filter_params}")
         return self.get(self.booking_endpoint, params=filter_params, requires_auth=False)
 
+    @timed()
     def get_booking_details(self, booking_id: int) -> Response:
         logger.info(f"Requesting details for booking ID: {booking_id}")
         return self.get(f"{self.booking_endpoint}/{booking_id}", requires_auth=False)
 
+    @timed()
     def update_booking(self, booking_id: int, booking_data: dict) -> Response:
         logger.info(f"Updating booking ID {booking_id}")
         if not self.auth_token:  # Ensure auth has happened
@@ -36,6 +41,7 @@ class BookingService(APIBase):
         # PUT requires authentication (token)
         return self.put(f"{self.booking_endpoint}/{booking_id}", json=booking_data, requires_auth=True)
 
+    @timed()
     def partial_update_booking(self, booking_id: int, booking_data: dict) -> Response:
         logger.info(f"Partially updating booking ID {booking_id}")
         if not self.auth_token:
@@ -43,6 +49,7 @@ class BookingService(APIBase):
         # PATCH requires authentication (token)
         return self.patch(f"{self.booking_endpoint}/{booking_id}", json=booking_data, requires_auth=True)
 
+    @timed()
     def delete_booking(self, booking_id: int) -> Response:
         logger.info(f"Deleting booking ID: {booking_id}")
         if not self.auth_token:
@@ -50,6 +57,7 @@ class BookingService(APIBase):
         # DELETE requires authentication (token)
         return self.delete(f"{self.booking_endpoint}/{booking_id}", requires_auth=True)
 
+    @timed()
     def health_check(self) -> Response:
         logger.info("Performing health check (ping)")
         return self.get("/ping", requires_auth=False)
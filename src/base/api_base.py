@@ -1,9 +1,19 @@
+import logging
+import weakref
+
 import requests
 
+from src.base.resilience import Resilience
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_clients = weakref.WeakSet()  # Live clients, for resource tracking (see src/plugins/soak.py)
+
+
+def iter_clients():
+    return list(_clients)
+
 
 class APIBase:
     def __init__(self, config: dict):
@@ -14,6 +24,8 @@ class APIBase:
         self.default_timeout = config.get("default_timeout", 10)
         self.config = config  # Store config for auth endpoint if needed
         self.auth_token = None  # To store the auth token
+        self.resilience = Resilience(config)  # Rate limiting, retries and circuit breaking per host
+        _clients.add(self)
 
         common_headers = {"Content-Type": "application/json", "Accept": "application/json"}
         self.session.headers.update(common_headers)
@@ -33,7 +45,11 @@ class APIBase:
         payload = {"username": username, "password": password}
         logger.info(f"Attempting API authentication to {auth_url}")
         try:
-            response = self.session.post(auth_url, json=payload, timeout=self.default_timeout)
+            response = self.resilience.execute(
+                "POST",
+                auth_url,
+                lambda: self.session.post(auth_url, json=payload, timeout=self.default_timeout),
+            )
             response.raise_for_status()  # Will raise an HTTPError for bad responses
             token_data = response.json()
             self.auth_token = token_data.get("token")
@@ -98,29 +114,39 @@ class APIBase:
                 # kwargs['auth'] = (self.auth_token, '') # username=token, password=''
 
         logger.info(f"API Request: {method.upper()} {url}")
-        if params:
-            logger.debug(f"Params: {params}")
-        if data:
-            logger.debug(f"Data (form-encoded): {data}")
-        if json:
-            logger.debug(f"JSON Payload: {json}")
-        if request_headers:
-            logger.debug(f"Effective Headers: {request_headers}")
-
+        debug = logger.isEnabledFor(logging.DEBUG)  # Skip building payload/header dumps nobody will see
+        if debug:
+            if params:
+                logger.debug(f"Params: {params}")
+            if data:
+                logger.debug(f"Data (form-encoded): {data}")
+            if json:
+                logger.debug(f"JSON Payload: {json}")
+            if request_headers:
+                logger.debug(f"Effective Headers: {request_headers}")
+
+        timeout = kwargs.pop("timeout", self.default_timeout)
         try:
-            response = self.session.request(
+            response = self.resilience.execute(
                 method,
                 url,
-                params=params,
-                data=data,
-                json=json,
-                headers=request_headers,  # Use the combined headers
-                timeout=kwargs.pop("timeout", self.default_timeout),
-                **kwargs,
+                lambda: self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    data=data,
+                    json=json,
+                    headers=request_headers,  # Use the combined headers
+                    timeout=timeout,
+                    **kwargs,
+                ),
             )
             logger.info(f"API Response: {response.status_code} for {method.upper()} {url}")
-            response_text_preview = response.text[:500] + "..." if len(response.text) > 500 else response.text
-            logger.debug(f"Response Body Preview: {response_text_preview}")
+            if debug:  # response.text decodes the whole body
+                response_text_preview = (
+                    response.text[:500] + "..." if len(response.text) > 500 else response.text
+                )
+                logger.debug(f"Response Body Preview: {response_text_preview}")
             return response
         except requests.exceptions.RequestException as e:
             logger.error(f"API Request Exception for {method.upper()} {url}: {e}")
@@ -0,0 +1,364 @@
+"""Resilience layer for the API request path.
+
+Wraps every request sent by ``APIBase`` with:
+
+- a per-host token-bucket rate limiter (static, or adaptive to ``Retry-After`` and latency),
+- jittered exponential retries for idempotent methods, bounded by a process-wide retry budget,
+- a per-host circuit breaker that fails fast while the host keeps failing.
+
+Limiters and breakers are shared by every client in the process that talks to the same host with the
+same settings; clients configured differently get their own.
+Each retry, throttle and trip is logged and recorded as an event so ``src.plugins.resilience_report``
+can surface it in the test reports.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {429, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+# Only an unreachable or overloaded host trips the breaker. Other 5xx responses (e.g. the 500 Restful-booker
+# returns for an invalid booking) come from a live server and are often exactly what a negative test expects.
+BREAKER_FAILURE_STATUSES = {502, 503, 504}
+
+DEFAULT_SETTINGS = {
+    "rate_limit": {
+        "enabled": True,
+        "rate": 10.0,  # Requests per second per host
+        "burst": 10,
+        "adaptive": True,
+        "min_rate": 1.0,
+        "max_rate": 50.0,
+        "latency_target": 2.0,  # Seconds; slower responses make the adaptive limiter back off
+    },
+    "retry": {
+        "enabled": True,
+        "max_retries": 3,
+        "backoff_base": 0.5,
+        "backoff_max": 8.0,
+        "max_retry_after": 8.0,  # Longer Retry-After requests are not waited for; the response is returned
+        "budget_ratio": 0.2,  # Retries allowed per request sent
+        "budget_min_per_second": 1.0,
+    },
+    "circuit_breaker": {
+        "enabled": True,
+        "failure_threshold": 5,
+        "reset_timeout": 30.0,
+    },
+}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the host's circuit breaker is open."""
+
+
+_events = []
+_events_lock = threading.Lock()
+
+
+def record_event(kind: str, host: str, detail: str):
+    """Logs a resilience event and keeps it until the reporting plugin drains it."""
+    logger.warning(f"[{kind}] {host}: {detail}")
+    with _events_lock:
+        _events.append({"kind": kind, "host": host, "detail": detail, "time": time.time()})
+
+
+def drain_events() -> list:
+    with _events_lock:
+        events = list(_events)
+        _events.clear()
+    return events
+
+
+def parse_retry_after(value):
+    """Returns the Retry-After header value in seconds (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class TokenBucket:
+    """Token-bucket rate limiter. In adaptive mode the refill rate follows server feedback (AIMD)."""
+
+    def __init__(self, rate, burst, adaptive=False, min_rate=1.0, max_rate=50.0, latency_target=2.0):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.adaptive = adaptive
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.latency_target = latency_target
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Blocks until a token is available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                else:
+                    delay = (1.0 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def on_response(self, status_code, latency, retry_after=None):
+        if not self.adaptive:
+            if retry_after:
+                self.pause(retry_after)
+            return
+        with self._lock:
+            if status_code in THROTTLE_STATUSES:
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif latency > self.latency_target:
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            elif status_code < 500:
+                self.rate = min(self.max_rate, self.rate + 0.5)
+        if retry_after:
+            self.pause(retry_after)
+
+    def pause(self, seconds):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class RetryBudget:
+    """Caps retries to a fraction of the requests sent, plus a small per-second allowance."""
+
+    def __init__(self, ratio=0.2, min_per_second=1.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = max(10.0, min_per_second * 10)
+        self.balance = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.balance = min(self.capacity, self.balance + (now - self.updated) * self.min_per_second)
+        self.updated = now
+
+    def deposit(self):
+        with self._lock:
+            self._refill()
+            self.balance = min(self.capacity, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self.balance >= 1.0:
+                self.balance -= 1.0
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures; half-open after `reset_timeout`."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, host, failure_threshold=5, reset_timeout=30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN  # Let a single trial request through
+                self.opened_at = time.monotonic()
+                return True
+            if self.state == self.HALF_OPEN:
+                # A trial request is in flight; allow another only if it never reported back
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.opened_at = time.monotonic()
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                record_event("circuit-close", self.host, "trial request succeeded")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    record_event(
+                        "circuit-open",
+                        self.host,
+                        f"{self.failures} consecutive failures, failing fast for {self.reset_timeout}s",
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+_hosts = {}
+_budgets = {}
+_hosts_lock = threading.Lock()
+
+
+def _merged_settings(config: dict) -> dict:
+    overrides = config.get("resilience", {}) or {}
+    return {
+        section: {**defaults, **overrides.get(section, {})} for section, defaults in DEFAULT_SETTINGS.items()
+    }
+
+
+def _settings_key(*sections) -> tuple:
+    return tuple(tuple(sorted(section.items())) for section in sections)
+
+
+class Resilience:
+    """Sends requests through the shared limiter, breaker and retry budget of the target host."""
+
+    def __init__(self, config: dict):
+        self.settings = _merged_settings(config)
+        retry = self.settings["retry"]
+        key = (retry["budget_ratio"], retry["budget_min_per_second"])
+        with _hosts_lock:
+            if key not in _budgets:
+                _budgets[key] = RetryBudget(*key)
+            self.budget = _budgets[key]
+
+    def _host_guards(self, host):
+        limit = self.settings["rate_limit"]
+        breaker = self.settings["circuit_breaker"]
+        key = (host, _settings_key(limit, breaker))
+        with _hosts_lock:
+            if key not in _hosts:
+                _hosts[key] = (
+                    TokenBucket(
+                        limit["rate"],
+                        limit["burst"],
+                        adaptive=limit["adaptive"],
+                        min_rate=limit["min_rate"],
+                        max_rate=limit["max_rate"],
+                        latency_target=limit["latency_target"],
+                    ),
+                    CircuitBreaker(host, breaker["failure_threshold"], breaker["reset_timeout"]),
+                )
+            return _hosts[key]
+
+    def _backoff(self, attempt, retry_after=None) -> float:
+        retry = self.settings["retry"]
+        delay = random.uniform(0, min(retry["backoff_max"], retry["backoff_base"] * 2**attempt))
+        return max(delay, min(retry_after or 0.0, retry["max_retry_after"]))
+
+    def execute(self, method: str, url: str, send) -> requests.Response:
+        """Calls `send()` (which performs the HTTP request) with rate limiting, retries and breaking."""
+        method = method.upper()
+        host = urlparse(url).netloc
+        limiter, breaker = self._host_guards(host)
+        limit_on = self.settings["rate_limit"]["enabled"]
+        breaker_on = self.settings["circuit_breaker"]["enabled"]
+        retry = self.settings["retry"]
+        max_retries = retry["max_retries"] if retry["enabled"] and method in IDEMPOTENT_METHODS else 0
+
+        attempt = 0
+        while True:
+            if breaker_on and not breaker.allow():
+                record_event("circuit-reject", host, f"{method} {url} rejected, circuit is {breaker.state}")
+                raise CircuitOpenError(f"Circuit breaker open for {host}")
+            if limit_on:
+                waited = limiter.acquire()
+                if waited > 0.05:
+                    record_event("throttle", host, f"{method} {url} delayed {waited:.2f}s by rate limiter")
+            if attempt == 0:
+                self.budget.deposit()
+
+            started = time.monotonic()
+            try:
+                response = send()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if breaker_on:
+                    breaker.record_failure()
+                if attempt < max_retries and self.budget.withdraw():
+                    delay = self._backoff(attempt)
+                    attempt += 1
+                    record_event("retry", host, f"{method} {url} attempt {attempt} in {delay:.2f}s after {e}")
+                    time.sleep(delay)
+                    continue
+                raise
+
+            latency = time.monotonic() - started
+            requested_wait = parse_retry_after(response.headers.get("Retry-After"))
+            # Never stall the host (and every test using it) for longer than a retry would wait
+            retry_after = min(requested_wait, retry["max_retry_after"]) if requested_wait else None
+            if limit_on:
+                limiter.on_response(response.status_code, latency, retry_after)
+                if response.status_code in THROTTLE_STATUSES:
+                    record_event(
+                        "throttle",
+                        host,
+                        f"{response.status_code} from server, rate now {limiter.rate:.1f}/s"
+                        + (f", pausing {retry_after:.1f}s" if retry_after else ""),
+                    )
+            if breaker_on:
+                if response.status_code in BREAKER_FAILURE_STATUSES:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+            if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                return response
+            if requested_wait and requested_wait > retry["max_retry_after"]:
+                record_event(
+                    "retry-after",
+                    host,
+                    f"{method} {url} not retried, server asked to wait {requested_wait:.0f}s "
+                    f"(max_retry_after {retry['max_retry_after']:g}s)",
+                )
+                return response
+            if not self.budget.withdraw():
+                record_event("retry-budget", host, f"{method} {url} not retried, retry budget exhausted")
+                return response
+            delay = self._backoff(attempt, retry_after)
+            attempt += 1
+            record_event(
+                "retry",
+                host,
+                f"{method} {url} attempt {attempt} in {delay:.2f}s after {response.status_code}",
+            )
+            response.close()
+            time.sleep(delay)
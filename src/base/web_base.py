@@ -4,6 +4,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from src.utils.logger import get_logger
+from src.utils.page_metrics import collect_page_metrics
 
 logger = get_logger(__name__)
 
@@ -14,10 +15,11 @@ class WebBase:
         self.config = config
         self.default_timeout = config.get("default_timeout", 10)
         self.wait = WebDriverWait(self.driver, self.default_timeout)
+        self.collect_metrics = config.get("page_metrics", {}).get("enabled", True)
 
     def _find_element(self, locator: tuple, timeout: int = None):
         current_wait = WebDriverWait(self.driver, timeout if timeout else self.default_timeout)
-        logger.debug(f"Finding element with locator: {locator}")
+        logger.debug("Finding element with locator: %s", locator)
         try:
             return current_wait.until(EC.presence_of_element_located(locator))
         except TimeoutException:
@@ -26,7 +28,7 @@ class WebBase:
 
     def _find_elements(self, locator: tuple, timeout: int = None):
         current_wait = WebDriverWait(self.driver, timeout if timeout else self.default_timeout)
-        logger.debug(f"Finding elements with locator: {locator}")
+        logger.debug("Finding elements with locator: %s", locator)
         try:
             return current_wait.until(EC.presence_of_all_elements_located(locator))
         except TimeoutException:
@@ -50,11 +52,11 @@ class WebBase:
         element.send_keys(text)
 
     def _get_text(self, locator: tuple, timeout: int = None) -> str:
-        logger.debug(f"Getting text from element with locator: {locator}")
+        logger.debug("Getting text from element with locator: %s", locator)
         return self._find_element(locator, timeout).text
 
     def _is_displayed(self, locator: tuple, timeout: int = 1) -> bool:  # Shorter timeout for checks
-        logger.debug(f"Checking if element {locator} is displayed.")
+        logger.debug("Checking if element %s is displayed.", locator)
         try:
             return self._find_element(locator, timeout).is_displayed()
         except (TimeoutException, NoSuchElementException):
@@ -64,6 +66,19 @@ class WebBase:
         full_url = self.config["base_web_url"] + url_path
         logger.info(f"Navigating to URL: {full_url}")
         self.driver.get(full_url)
+        if self.collect_metrics:
+            self.record_page_metrics(url_path or "/")
+
+    def record_page_metrics(self, label: str = None) -> dict:
+        """Collects performance metrics for the current page (e.g. after an in-app transition)."""
+        metrics = collect_page_metrics(self.driver, label or type(self).__name__)
+        if metrics:
+            self.on_page_load(metrics)
+        return metrics
+
+    def on_page_load(self, metrics: dict):
+        """Hook for page objects: called with the metrics of every page load they record."""
+        pass
 
     def get_current_url(self) -> str:
         return self.driver.current_url
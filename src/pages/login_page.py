@@ -2,6 +2,7 @@ from selenium.webdriver.common.by import By
 
 from src.base.web_base import WebBase
 from src.utils.logger import get_logger
+from src.utils.perf import timed
 
 logger = get_logger(__name__)
 
@@ -29,6 +30,7 @@ class LoginPage(WebBase):
         logger.info("Clicking login button")
         self._click(self.LOGIN_BUTTON_SUBMIT)
 
+    @timed()
     def login(self, username: str, password: str):
         logger.info(f"Attempting login for user: {username}")
         self.enter_username(username)
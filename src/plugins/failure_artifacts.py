@@ -0,0 +1,163 @@
+"""Captures a screenshot, page source and browser console log when a web test fails.
+
+Only the raw data is fetched on the test's thread (three WebDriver calls, while the browser is still
+alive). Decoding, truncation, compression and writing the files happen on a background thread pool,
+overlapping with fixture teardown. Artifacts that are ready by the end of teardown are attached to
+the test in Allure; the rest are still written to disk and the pool is flushed at session end.
+
+The ``web_driver`` fixture stores its driver and config in the test's stash (``WEB_DRIVER_STASH``,
+``CONFIG_STASH``): when a fixture depending on it fails during setup, ``item.funcargs`` is not filled
+in yet, and setup is where web tests navigate.
+"""
+
+import base64
+import gzip
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import allure
+import pytest
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WEB_DRIVER_STASH = pytest.StashKey[object]()
+CONFIG_STASH = pytest.StashKey[dict]()
+
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "dir": os.path.join("reports", "failure-artifacts"),
+    "workers": 2,
+    "max_screenshot_bytes": 5 * 1024 * 1024,
+    "max_page_source_bytes": 1024 * 1024,  # Larger sources are truncated for Allure; the full one is gzipped
+    "max_console_entries": 500,
+    "attach_wait": 2.0,  # Seconds to wait at the end of teardown for artifacts still being written
+}
+
+ATTACHMENT_TYPES = {
+    "screenshot.png": allure.attachment_type.PNG,
+    "page_source.html": allure.attachment_type.HTML,
+    "console.log": allure.attachment_type.TEXT,
+}
+
+
+def _safe_name(nodeid: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")[:150]
+
+
+def grab_raw(driver) -> dict:
+    """Fetches the raw failure data on the test thread, in as few WebDriver calls as possible."""
+    raw = {}
+    for key, fetch in (
+        ("screenshot", driver.get_screenshot_as_base64),  # Base64 is the wire format; decode off-thread
+        ("page_source", lambda: driver.page_source),
+        ("console", lambda: driver.get_log("browser")),  # Not supported by every driver (e.g. Firefox)
+    ):
+        try:
+            raw[key] = fetch()
+        except Exception as e:
+            logger.debug("Could not capture %s: %s", key, e)
+    return raw
+
+
+def write_artifacts(raw: dict, directory: str, settings: dict) -> list:
+    """Decodes, caps and writes the captured data. Runs on the pool. Returns [(file name, path)]."""
+    os.makedirs(directory, exist_ok=True)
+    written = []
+
+    def _write(name, data):
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        written.append((name, path))
+
+    if raw.get("screenshot"):
+        png = base64.b64decode(raw["screenshot"])
+        if len(png) <= settings["max_screenshot_bytes"]:
+            _write("screenshot.png", png)
+        else:
+            logger.warning(f"Screenshot of {len(png)} bytes exceeds cap, not saved ({directory})")
+
+    if raw.get("page_source"):
+        source = raw["page_source"].encode("utf-8", errors="replace")
+        cap = settings["max_page_source_bytes"]
+        if len(source) > cap:
+            _write("page_source.full.html.gz", gzip.compress(source))
+            source = source[:cap] + b"\n<!-- truncated, see page_source.full.html.gz -->"
+        _write("page_source.html", source)
+
+    if raw.get("console"):
+        entries = raw["console"]
+        cap = settings["max_console_entries"]
+        lines = [f"{e.get('timestamp')} {e.get('level')} {e.get('message')}" for e in entries[-cap:]]
+        if len(entries) > cap:
+            lines.insert(0, f"... {len(entries) - cap} earlier entries dropped")
+        _write("console.log", "\n".join(lines).encode("utf-8"))
+
+    return written
+
+
+class FailureArtifactCollector:
+    def __init__(self):
+        self.executor = None
+        self.pending = {}  # nodeid -> [(future, phase, attach_wait)]
+        self.captured = 0
+
+    def _settings(self, item) -> dict:
+        config = item.stash.get(CONFIG_STASH, None) or item.funcargs.get("config") or {}
+        return {**DEFAULT_SETTINGS, **(config.get("failure_artifacts") or {})}
+
+    def capture(self, item, when):
+        driver = item.stash.get(WEB_DRIVER_STASH, None)
+        settings = self._settings(item)
+        if driver is None or not settings["enabled"]:
+            return
+        raw = grab_raw(driver)
+        if not raw:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=settings["workers"], thread_name_prefix="failure-artifacts"
+            )
+        directory = os.path.join(settings["dir"], _safe_name(item.nodeid), when)
+        future = self.executor.submit(write_artifacts, raw, directory, settings)
+        self.pending.setdefault(item.nodeid, []).append((future, when, settings["attach_wait"]))
+        self.captured += 1
+        logger.info(f"Failure artifacts for {item.nodeid} ({when}) queued to {directory}")
+
+    def attach(self, item):
+        for future, when, attach_wait in self.pending.pop(item.nodeid, []):
+            done, _ = wait([future], timeout=attach_wait)
+            if not done:
+                logger.warning(f"Failure artifacts for {item.nodeid} not ready; left on disk, not attached")
+                continue
+            try:
+                written = future.result()
+            except Exception as e:
+                logger.error(f"Failed to write failure artifacts for {item.nodeid}: {e}")
+                continue
+            for name, path in written:
+                if name in ATTACHMENT_TYPES:
+                    allure.attach.file(path, name=f"{name} ({when})", attachment_type=ATTACHMENT_TYPES[name])
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if call.when in ("setup", "call") and report.failed:
+            self.capture(item, call.when)
+        elif call.when == "teardown" and item.nodeid in self.pending:
+            # The web_driver teardown has run by now; the pool worked on the files in the meantime
+            self.attach(item)
+
+    def pytest_sessionfinish(self, session):
+        if self.executor is None:
+            return
+        self.executor.shutdown(wait=True)
+        logger.info(f"Flushed failure artifacts for {self.captured} failed test phase(s)")
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(FailureArtifactCollector(), "failure_artifact_collector")
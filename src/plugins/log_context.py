@@ -0,0 +1,37 @@
+"""Wires the framework's queued logging pipeline into the pytest run.
+
+Adds ``--log-json PATH`` for a structured JSON-lines sink, tags records with the running test id,
+and flushes the listener thread when the session ends.
+"""
+
+import pytest
+
+from src.utils.logger import LOG_JSON_FILE, configure_logging, set_test_context, shutdown_logging
+
+
+def pytest_addoption(parser):
+    parser.getgroup("logging").addoption(
+        "--log-json",
+        action="store",
+        default=LOG_JSON_FILE,
+        metavar="PATH",
+        help="Also write framework logs as JSON lines (with test id and xdist worker) to PATH. "
+        "Each xdist worker writes its own PATH with the worker id inserted before the extension.",
+    )
+
+
+def pytest_configure(config):
+    configure_logging(config.getoption("log_json"))  # Inserts the xdist worker id into the path
+
+
+def pytest_runtest_logstart(nodeid, location):
+    set_test_context(nodeid)
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    set_test_context(None)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config):
+    shutdown_logging()
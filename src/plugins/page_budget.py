@@ -0,0 +1,101 @@
+"""Attaches browser page metrics to each test and enforces ``@pytest.mark.page_budget``.
+
+Example::
+
+    @pytest.mark.page_budget(load_ms=3000, resources=60, js_heap_mb=50)
+
+Every page sample recorded during the test (see ``src.utils.page_metrics``) must stay within each
+given limit, otherwise the test fails. Supported limits are listed in ``BUDGET_KEYS``. A budgeted
+metric the browser did not report, or a test that recorded no samples because ``page_metrics`` is
+disabled in the config, only produces a ``PageBudgetWarning``.
+"""
+
+import json
+
+import allure
+import pytest
+
+from src.utils.page_metrics import drain_page_metrics
+
+BUDGET_KEYS = (
+    "load_ms",
+    "dom_content_loaded_ms",
+    "ttfb_ms",
+    "first_paint_ms",
+    "first_contentful_paint_ms",
+    "resources",
+    "transfer_bytes",
+    "js_heap_mb",
+)
+
+
+class PageBudgetWarning(UserWarning):
+    pass
+
+
+def _metric_value(sample: dict, key: str):
+    if key == "js_heap_mb":
+        heap = sample.get("js_heap_bytes")
+        return None if heap is None else heap / (1024 * 1024)
+    return sample.get(key)
+
+
+def check_budget(samples: list, budget: dict) -> list:
+    """Returns a description of every sample metric over its budget."""
+    violations = []
+    for sample in samples:
+        for key, limit in budget.items():
+            value = _metric_value(sample, key)
+            if value is not None and value > limit:
+                violations.append(f"{sample.get('label')} ({sample.get('url')}): {key}={value:.0f} > {limit}")
+    return violations
+
+
+def missing_metrics(samples: list, budget: dict) -> list:
+    """Returns a description of every budgeted metric a sample did not report (so it was not checked)."""
+    missing = []
+    for sample in samples:
+        keys = [key for key in budget if _metric_value(sample, key) is None]
+        if keys:
+            missing.append(f"{sample.get('label')} ({sample.get('url')}): {', '.join(keys)}")
+    return missing
+
+
+def _collection_enabled(item) -> bool:
+    config = item.funcargs.get("config") or {}
+    return config.get("page_metrics", {}).get("enabled", True)
+
+
+def pytest_runtest_logstart(nodeid, location):
+    drain_page_metrics()  # Drop samples taken outside a test (e.g. by session fixtures)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    try:
+        result = yield
+    finally:
+        samples = drain_page_metrics()
+        if samples:
+            allure.attach(
+                json.dumps(samples, indent=2),
+                name="Page performance metrics",
+                attachment_type=allure.attachment_type.JSON,
+            )
+    marker = item.get_closest_marker("page_budget")
+    if marker is not None:
+        unknown = set(marker.kwargs) - set(BUDGET_KEYS)
+        if unknown:
+            pytest.fail(f"Unknown page_budget keys {sorted(unknown)}, expected {BUDGET_KEYS}", pytrace=False)
+        if not samples:
+            if not _collection_enabled(item):
+                item.warn(PageBudgetWarning("page_budget not checked: page_metrics is disabled in config"))
+                return result
+            pytest.fail("page_budget set but no page metrics were recorded", pytrace=False)
+        missing = missing_metrics(samples, marker.kwargs)
+        if missing:
+            item.warn(PageBudgetWarning("page_budget metrics not reported: " + "; ".join(missing)))
+        violations = check_budget(samples, marker.kwargs)
+        if violations:
+            pytest.fail("Page budget exceeded:\n" + "\n".join(violations), pytrace=False)
+    return result
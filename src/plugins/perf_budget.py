@@ -0,0 +1,197 @@
+"""Latency budgets and baseline regression checks for tests marked ``@pytest.mark.perf_budget``.
+
+Example::
+
+    @pytest.mark.perf_budget(test_ms=2000, calls={"BookingService.create_booking": 800}, tolerance=0.5)
+
+- ``test_ms``: absolute budget for the test body.
+- ``calls``: absolute budgets for methods decorated with ``src.utils.perf.timed`` (median per test).
+- ``tolerance``: allowed slowdown against the stored baseline, as a fraction of its median. The
+  threshold is never tighter than three scaled MADs of the baseline samples (or ``MIN_REGRESSION_MS``),
+  so noisy timings do not flap.
+
+Baselines are kept in ``.perf_baseline.json`` (``--perf-baseline``) as the last samples per test and call.
+They only change with ``--perf-update-baseline``, which records this run's timings instead of failing.
+"""
+
+import json
+import os
+import statistics
+import time
+
+import pytest
+
+from src.utils.logger import get_logger
+from src.utils.node_ids import base_nodeid
+from src.utils.perf import drain_timings
+
+logger = get_logger(__name__)
+
+DEFAULT_BASELINE_PATH = ".perf_baseline.json"
+DEFAULT_TOLERANCE = 0.5
+MIN_REGRESSION_MS = 20  # Slowdowns smaller than this are treated as noise
+BASELINE_HISTORY = 20  # Samples kept per test/call
+TEST_KEY = "<test>"
+USER_PROPERTY = "perf_samples"
+BASELINE_STASH = pytest.StashKey[dict]()
+BUDGET_KEYS = ("test_ms", "calls", "tolerance")
+
+
+class PerfRegressionWarning(UserWarning):
+    pass
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf_budget", "latency budgets")
+    group.addoption(
+        "--perf-baseline",
+        action="store",
+        default=DEFAULT_BASELINE_PATH,
+        help=f"JSON file with stored timing baselines (default: {DEFAULT_BASELINE_PATH}).",
+    )
+    group.addoption(
+        "--perf-update-baseline",
+        action="store_true",
+        default=False,
+        help="Record this run's timings into the baseline instead of checking for regressions.",
+    )
+    group.addoption(
+        "--perf-warn-only",
+        action="store_true",
+        default=False,
+        help="Report budget violations and regressions as warnings instead of failures.",
+    )
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        logger.warning(f"Ignoring unreadable perf baseline: {path}")
+        return {}
+
+
+def marker_error(args: tuple, kwargs: dict):
+    """Returns why the perf_budget marker arguments are invalid, or None."""
+    problems = []
+    if args:
+        problems.append(f"positional arguments {args}")
+    unknown = sorted(set(kwargs) - set(BUDGET_KEYS))
+    if unknown:
+        problems.append(f"unknown keys {unknown}")
+    if problems:
+        return f"perf_budget takes only the keyword arguments {BUDGET_KEYS}; got " + " and ".join(problems)
+    return None
+
+
+def regression_threshold(history: list, tolerance: float) -> float:
+    median = statistics.median(history)
+    mad = statistics.median(abs(x - median) for x in history)
+    return median + max(tolerance * median, 3 * 1.4826 * mad, MIN_REGRESSION_MS)
+
+
+def check_samples(samples: dict, baseline: dict, budget: dict) -> list:
+    """Returns violations of absolute budgets and regressions against the baseline (times in ms)."""
+    problems = []
+    limits = dict(budget.get("calls") or {})
+    if budget.get("test_ms") is not None:
+        limits[TEST_KEY] = budget["test_ms"]
+    tolerance = budget.get("tolerance", DEFAULT_TOLERANCE)
+
+    for key, value in samples.items():
+        label = "test body" if key == TEST_KEY else key
+        if key in limits and value > limits[key]:
+            problems.append(f"{label}: {value:.0f} ms exceeds budget of {limits[key]} ms")
+        history = baseline.get(key)
+        if history:
+            threshold = regression_threshold(history, tolerance)
+            if value > threshold:
+                problems.append(
+                    f"{label}: {value:.0f} ms regressed against baseline median "
+                    f"{statistics.median(history):.0f} ms (threshold {threshold:.0f} ms)"
+                )
+    return problems
+
+
+def pytest_runtest_logstart(nodeid, location):
+    drain_timings()  # Drop timings taken by earlier tests and session fixtures
+
+
+@pytest.hookimpl(wrapper=True, trylast=True)
+def pytest_runtest_call(item):
+    # trylast: innermost wrapper, so test_ms covers only the test body and not the work other
+    # wrappers (e.g. page_budget's Allure attach and budget check) do around it
+    marker = item.get_closest_marker("perf_budget")
+    if marker is None:
+        return (yield)
+    error = marker_error(marker.args, marker.kwargs)
+    if error:
+        pytest.fail(error, pytrace=False)
+
+    drain_timings()  # Setup fixtures (e.g. one creating a booking) must not count towards `calls`
+    started = time.perf_counter()
+    result = yield
+    samples = {TEST_KEY: (time.perf_counter() - started) * 1000}
+    calls = {}
+    for name, seconds in drain_timings():
+        calls.setdefault(name, []).append(seconds * 1000)
+    samples.update({name: statistics.median(values) for name, values in calls.items()})
+    item.user_properties[:] = [p for p in item.user_properties if p[0] != USER_PROPERTY]  # Reruns
+    item.user_properties.append((USER_PROPERTY, samples))
+
+    config = item.config
+    if config.getoption("perf_update_baseline"):
+        return result
+    if BASELINE_STASH not in config.stash:
+        config.stash[BASELINE_STASH] = load_baseline(str(config.rootpath / config.getoption("perf_baseline")))
+    baseline = config.stash[BASELINE_STASH].get(base_nodeid(item.nodeid), {})
+    problems = check_samples(samples, baseline, marker.kwargs)
+    if problems:
+        message = "Performance budget: " + "; ".join(problems)
+        if config.getoption("perf_warn_only"):
+            item.warn(PerfRegressionWarning(message))
+        else:
+            pytest.fail(message, pytrace=False)
+    return result
+
+
+class BaselineRecorder:
+    """Collects samples on the controller (reports carry them from xdist workers) and saves them."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.samples = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call" or not report.passed:
+            return
+        for name, samples in report.user_properties:
+            if name == USER_PROPERTY:
+                self.samples[base_nodeid(report.nodeid)] = samples
+
+    def pytest_sessionfinish(self, session):
+        if not self.samples:
+            return
+        baseline = load_baseline(self.path)
+        for nodeid, samples in self.samples.items():
+            entry = baseline.setdefault(nodeid, {})
+            for key, value in samples.items():
+                entry[key] = (entry.get(key, []) + [round(value, 1)])[-BASELINE_HISTORY:]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+        logger.info(f"Updated perf baseline for {len(self.samples)} tests in {self.path}")
+
+
+def pytest_configure(config):
+    if config.getoption("perf_update_baseline") and not hasattr(config, "workerinput"):
+        path = str(config.rootpath / config.getoption("perf_baseline"))
+        config.pluginmanager.register(BaselineRecorder(path), "perf_baseline_recorder")
@@ -0,0 +1,53 @@
+"""Surfaces API resilience events (retries, throttling, circuit breaker trips) in the reports.
+
+Events recorded by ``src.base.resilience`` during a test phase are attached to that test in Allure
+and stored in the report's ``user_properties`` (so they reach the xdist controller), then summarised
+at the end of the terminal output.
+"""
+
+import json
+from collections import Counter
+
+import allure
+import pytest
+
+from src.base.resilience import drain_events
+
+USER_PROPERTY = "resilience_events"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    events = drain_events()
+    if not events:
+        return
+    report = outcome.get_result()
+    report.user_properties.append((USER_PROPERTY, events))
+    allure.attach(
+        json.dumps(events, indent=2),
+        name=f"Resilience events ({call.when})",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+
+class ResilienceSummary:
+    def __init__(self):
+        self.counts = Counter()
+
+    def pytest_runtest_logreport(self, report):
+        for name, events in report.user_properties:
+            if name == USER_PROPERTY:
+                self.counts.update((event["kind"], event["host"]) for event in events)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.counts:
+            return
+        terminalreporter.write_sep("=", "API resilience events")
+        for (kind, host), count in sorted(self.counts.items()):
+            terminalreporter.write_line(f"{kind:<16} {host:<40} {count}")
+
+
+def pytest_configure(config):
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(ResilienceSummary(), "resilience_summary")
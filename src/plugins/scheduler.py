@@ -0,0 +1,280 @@
+"""Duration-aware test ordering and balanced sharding.
+
+Per-test durations are recorded every run in a JSON store. On the next run the collected
+items are reordered longest-first so that xdist workers pick up the expensive browser tests
+early, and ``--shard i/N`` splits the suite into N shards of roughly equal total duration.
+
+A sharded run only times its own shard, so it leaves the shared store alone and writes its timings to
+``<store>.shard-i-of-N.json`` instead; merge those into the store once every shard has finished, so all
+machines keep computing the same shard map.
+"""
+
+import json
+import os
+import re
+
+import pytest
+
+from src.utils.logger import get_logger
+from src.utils.node_ids import base_nodeid
+
+logger = get_logger(__name__)
+
+DEFAULT_DURATIONS_PATH = ".test_durations.json"
+DEFAULT_DURATION = 1.0  # Seconds assumed for a test we have never timed (and have nothing to compare to)
+SMOOTHING = 0.5  # Weight of the latest run when updating a stored duration
+
+# Fixtures that are expensive to set up. Tests using a module/session scoped one are kept together
+# (same xdist worker, original order) so the fixture is built once; function scoped ones only
+# influence the duration estimate of tests we have not timed yet.
+EXPENSIVE_FIXTURES = ("web_driver", "booking_service_client")
+SHARED_FIXTURES = ("booking_service_client",)
+
+GROUP_PREFIX = "sched-"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("scheduler", "duration-aware scheduling")
+    group.addoption(
+        "--shard",
+        action="store",
+        default=None,
+        metavar="i/N",
+        help="Run only shard i of N (1-based), balanced by recorded test durations.",
+    )
+    group.addoption(
+        "--durations-path",
+        action="store",
+        default=DEFAULT_DURATIONS_PATH,
+        help=f"JSON file storing per-test durations (default: {DEFAULT_DURATIONS_PATH}).",
+    )
+    group.addoption(
+        "--no-duration-schedule",
+        action="store_true",
+        default=False,
+        help="Keep collection order and do not record durations.",
+    )
+
+
+def parse_shard(value: str):
+    """Parses an 'i/N' shard spec into a (index, count) tuple with a 1-based index."""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value or "")
+    if not match:
+        raise pytest.UsageError(f"--shard expects 'i/N', got '{value}'")
+    index, count = int(match.group(1)), int(match.group(2))
+    if count < 1 or not 1 <= index <= count:
+        raise pytest.UsageError(f"--shard index must be between 1 and N, got '{value}'")
+    return index, count
+
+
+def shard_path(path: str, index: int, count: int) -> str:
+    """Returns the file a shard writes its timings to, e.g. '.test_durations.shard-1-of-3.json'."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard-{index}-of-{count}{ext or '.json'}"
+
+
+class DurationStore:
+    """Per-test durations (in seconds) persisted as a JSON mapping of node id to duration."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.durations = {}
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.durations = {k: float(v) for k, v in data.items()}
+        except FileNotFoundError:
+            self.durations = {}
+        except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+            logger.warning(f"Ignoring unreadable durations file: {self.path}")
+            self.durations = {}
+        return self
+
+    def update(self, observed: dict) -> dict:
+        """Folds observed durations into the store. Returns the updated entries."""
+        updated = {}
+        for nodeid, duration in observed.items():
+            previous = self.durations.get(nodeid)
+            if previous is None:
+                updated[nodeid] = duration
+            else:
+                updated[nodeid] = SMOOTHING * duration + (1 - SMOOTHING) * previous
+        self.durations.update(updated)
+        return updated
+
+    def save(self, durations=None, path=None):
+        """Writes `durations` (default: the whole store) to `path` (default: the store's own file)."""
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(sorted((self.durations if durations is None else durations).items())), f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, path)
+
+    def get(self, nodeid: str):
+        return self.durations.get(nodeid)
+
+
+def _fixture_kind(item) -> str:
+    used = set(getattr(item, "fixturenames", ()))
+    return ",".join(name for name in EXPENSIVE_FIXTURES if name in used)
+
+
+def _group_name(item):
+    """Returns the scheduling group for tests sharing a module/session scoped expensive fixture."""
+    used = set(getattr(item, "fixturenames", ()))
+    for name in SHARED_FIXTURES:
+        if name in used:
+            return f"{GROUP_PREFIX}{name}:{item.nodeid.split('::')[0]}"
+    return None
+
+
+class DurationScheduler:
+    def __init__(self, config):
+        self.config = config
+        self.store = DurationStore(str(config.rootpath / config.getoption("durations_path"))).load()
+        shard = config.getoption("shard")
+        self.shard = parse_shard(shard) if shard else None
+        self.observed = {}
+        self.skipped = set()
+
+    def estimate(self, items) -> dict:
+        """Returns {nodeid: seconds}, filling untimed tests with the mean of similar timed tests."""
+        known, by_kind = {}, {}
+        for item in items:
+            nodeid = base_nodeid(item.nodeid)
+            duration = self.store.get(nodeid)
+            if duration is not None:
+                known[nodeid] = duration
+                by_kind.setdefault(_fixture_kind(item), []).append(duration)
+
+        overall = sum(known.values()) / len(known) if known else DEFAULT_DURATION
+        estimates = {}
+        for item in items:
+            nodeid = base_nodeid(item.nodeid)
+            if nodeid in known:
+                estimates[nodeid] = known[nodeid]
+            else:
+                similar = by_kind.get(_fixture_kind(item))
+                estimates[nodeid] = sum(similar) / len(similar) if similar else overall
+        return estimates
+
+    @staticmethod
+    def build_units(items, estimates):
+        """Splits items into scheduling units: a shared-fixture group or a single test.
+
+        Returns a list of (cost, first_index, [items]) in collection order.
+        """
+        units, by_group = [], {}
+        for index, item in enumerate(items):
+            group = _group_name(item)
+            if group is None:
+                units.append([0.0, index, [item]])
+                continue
+            if group not in by_group:
+                by_group[group] = [0.0, index, []]
+                units.append(by_group[group])
+            by_group[group][2].append(item)
+        for unit in units:
+            unit[0] = sum(estimates[base_nodeid(item.nodeid)] for item in unit[2])
+        return [tuple(unit) for unit in units]
+
+    @staticmethod
+    def assign_shards(units, count: int):
+        """Greedy longest-processing-time assignment of units to `count` shards."""
+        shards = [[] for _ in range(count)]
+        loads = [0.0] * count
+        for unit in sorted(units, key=lambda u: (-u[0], u[1])):
+            target = loads.index(min(loads))
+            shards[target].append(unit)
+            loads[target] += unit[0]
+        return shards, loads
+
+    def tag_groups(self, items):
+        for item in items:
+            group = _group_name(item)
+            if group is not None:
+                item.add_marker(pytest.mark.xdist_group(name=group))
+
+    def schedule(self, items):
+        estimates = self.estimate(items)
+        units = self.build_units(items, estimates)
+
+        if self.shard:
+            index, count = self.shard
+            shards, loads = self.assign_shards(units, count)
+            units = shards[index - 1]
+            kept = {id(item) for unit in units for item in unit[2]}
+            deselected = [item for item in items if id(item) not in kept]
+            if deselected:
+                self.config.hook.pytest_deselected(items=deselected)
+            logger.info(
+                f"Shard {index}/{count}: {len(kept)} tests, estimated {loads[index - 1]:.1f}s "
+                f"(shard loads: {', '.join(f'{load:.1f}s' for load in loads)})"
+            )
+
+        # Longest-first: workers pull from the front, so the short tests fill in the gaps at the end.
+        units = sorted(units, key=lambda u: (-u[0], u[1]))
+        items[:] = [item for unit in units for item in unit[2]]
+
+    def record(self, report):
+        nodeid = base_nodeid(report.nodeid)
+        if report.skipped:
+            self.skipped.add(nodeid)
+        # A new setup starts a new run of the test (reruns, soak iterations): keep only the latest run
+        previous = 0.0 if report.when == "setup" else self.observed.get(nodeid, 0.0)
+        self.observed[nodeid] = previous + report.duration
+
+    def persist(self):
+        observed = {k: v for k, v in self.observed.items() if k not in self.skipped}
+        if not observed:
+            return
+        updated = self.store.update(observed)
+        if self.shard:
+            # Only this shard's tests were timed; keep the shared store identical on every machine
+            path = shard_path(self.store.path, *self.shard)
+            durations = updated
+        else:
+            path, durations = self.store.path, None
+        try:
+            self.store.save(durations, path)
+            logger.info(f"Recorded durations for {len(observed)} tests in {path}")
+        except OSError as e:
+            logger.error(f"Failed to write durations file {path}: {e}")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, items):
+        # Runs before xdist rewrites node ids for --dist loadgroup, so the groups are honoured.
+        self.tag_groups(items)
+
+    def pytest_runtest_logreport(self, report):
+        if hasattr(self.config, "workerinput"):
+            return  # The xdist controller receives the same reports and does the recording
+        self.record(report)
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput"):
+            return
+        self.persist()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    # trylast: shard and order only what is left after -m/-k deselection.
+    scheduler = config.pluginmanager.get_plugin("duration_scheduler")
+    if scheduler is not None:
+        scheduler.schedule(items)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "xdist_group(name): run tests of the same group on one xdist worker")
+    if config.getoption("no_duration_schedule"):
+        if config.getoption("shard"):
+            raise pytest.UsageError("--shard cannot be combined with --no-duration-schedule")
+        return
+    config.pluginmanager.register(DurationScheduler(config), "duration_scheduler")
@@ -0,0 +1,307 @@
+"""Soak mode: repeat the selected tests for a duration or iteration count and track resource growth.
+
+    pytest -m api --soak-duration 2h
+    pytest tests/web --soak-iterations 200 --soak-sample-every 5
+
+Between iterations (function fixtures torn down, session/module fixtures still alive) the plugin samples
+process RSS (minus the memory ``tracemalloc`` itself uses to store traces, which grows with the run),
+``tracemalloc`` traced memory, open file descriptors, sockets and threads, child processes
+(e.g. chromedriver and browsers that were never reaped), live ``requests.Response`` objects and the
+connection pools and cookie jars of every live ``APIBase`` session. Growth from the first sample to the
+end of the run is compared with the thresholds below (override with ``--soak-max-growth KEY=VALUE``);
+exceeding one fails the run. A JSON report with every sample, per-iteration trends and the top
+``tracemalloc`` allocators is written to ``--soak-report``.
+"""
+
+import gc
+import json
+import os
+import re
+import statistics
+import time
+import tracemalloc
+
+import pytest
+import requests
+
+from src.base.api_base import iter_clients
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_REPORT_PATH = os.path.join("reports", "soak-report.json")
+DEFAULT_MAX_GROWTH = {
+    "rss_mb": 200,
+    "traced_mb": 100,
+    "fds": 50,
+    "sockets": 20,
+    "threads": 10,
+    "children": 2,
+    "live_responses": 1000,
+    "clients": 5,
+    "pools": 10,
+    "cookies": 100,
+}
+WINDOW = 3  # Samples averaged (median) at each end of the run when computing growth
+TOP_ALLOCATORS = 10
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("soak", "soak runs with resource leak tracking")
+    group.addoption(
+        "--soak-duration",
+        action="store",
+        default=None,
+        help="Repeat the selected tests for this long, e.g. 900, 30m or 2h.",
+    )
+    group.addoption(
+        "--soak-iterations",
+        action="store",
+        type=int,
+        default=None,
+        help="Repeat the selected tests this many times (with --soak-duration, whichever ends first).",
+    )
+    group.addoption(
+        "--soak-sample-every",
+        action="store",
+        type=int,
+        default=1,
+        help="Sample resources every N iterations (default: 1).",
+    )
+    group.addoption(
+        "--soak-max-growth",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help=f"Override a growth threshold; keys: {', '.join(DEFAULT_MAX_GROWTH)}.",
+    )
+    group.addoption(
+        "--soak-report",
+        action="store",
+        default=DEFAULT_REPORT_PATH,
+        help=f"Where to write the JSON soak report (default: {DEFAULT_REPORT_PATH}).",
+    )
+
+
+def parse_duration(value: str) -> float:
+    """Parses '90', '90s', '30m' or '2h' into seconds."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", value or "")
+    if not match:
+        raise pytest.UsageError(f"--soak-duration expects e.g. 900, 30m or 2h, got '{value}'")
+    seconds = float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    if seconds <= 0:
+        raise pytest.UsageError(f"--soak-duration must be greater than 0, got '{value}'")
+    return seconds
+
+
+def parse_thresholds(overrides: list) -> dict:
+    thresholds = dict(DEFAULT_MAX_GROWTH)
+    for override in overrides:
+        key, _, value = override.partition("=")
+        if key not in DEFAULT_MAX_GROWTH:
+            keys = ", ".join(DEFAULT_MAX_GROWTH)
+            raise pytest.UsageError(f"Unknown --soak-max-growth key '{key}'; use {keys}")
+        try:
+            thresholds[key] = float(value)
+        except ValueError:
+            raise pytest.UsageError(f"--soak-max-growth expects KEY=NUMBER, got '{override}'")
+    return thresholds
+
+
+def _session_stats() -> dict:
+    clients = iter_clients()
+    stats = {"clients": len(clients), "pools": 0, "pool_idle": 0, "connections_opened": 0, "cookies": 0}
+    for client in clients:
+        stats["cookies"] += len(client.session.cookies)
+        for adapter in client.session.adapters.values():
+            manager = getattr(adapter, "poolmanager", None)
+            if manager is None:
+                continue
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                stats["pools"] += 1
+                stats["connections_opened"] += pool.num_connections  # Over the pool's life; shows churn
+                stats["pool_idle"] += pool.pool.qsize() if pool.pool is not None else 0
+    return stats
+
+
+def trend(samples: list, key: str) -> float:
+    """Least-squares slope of `key` per iteration."""
+    points = [(s["iteration"], s[key]) for s in samples if s.get(key) is not None]
+    if len(points) < 2:
+        return 0.0
+    mean_x = statistics.mean(x for x, _ in points)
+    mean_y = statistics.mean(y for _, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator if denominator else 0.0
+
+
+def growth(samples: list, key: str):
+    values = [s[key] for s in samples if s.get(key) is not None]
+    if len(values) < 2:
+        return None
+    window = min(WINDOW, len(values) // 2) or 1
+    return statistics.median(values[-window:]) - statistics.median(values[:window])
+
+
+class SoakRunner:
+    def __init__(self, config, psutil):
+        self.config = config
+        self.psutil = psutil
+        self.process = psutil.Process()
+        duration = config.getoption("soak_duration")
+        self.duration = parse_duration(duration) if duration else None
+        self.iterations = config.getoption("soak_iterations")
+        self.sample_every = max(1, config.getoption("soak_sample_every"))
+        self.thresholds = parse_thresholds(config.getoption("soak_max_growth"))
+        self.report_path = config.getoption("soak_report")
+        self.samples = []
+        self.first_snapshot = None
+        self.violations = []
+        self.report = None
+
+    def sample(self, iteration: int, elapsed: float):
+        gc.collect()  # Only count what is actually still referenced
+        process = self.process
+        try:
+            sockets = len(process.net_connections())
+        except AttributeError:  # psutil < 6
+            sockets = len(process.connections())
+        except self.psutil.Error:
+            sockets = None
+        overhead = tracemalloc.get_tracemalloc_memory()  # Our own trace storage, not the code under test
+        sample = {
+            "iteration": iteration,
+            "elapsed_s": round(elapsed, 1),
+            "rss_mb": round((process.memory_info().rss - overhead) / (1024 * 1024), 2),
+            "tracemalloc_overhead_mb": round(overhead / (1024 * 1024), 2),
+            "traced_mb": round(tracemalloc.get_traced_memory()[0] / (1024 * 1024), 2),
+            "fds": process.num_fds() if hasattr(process, "num_fds") else process.num_handles(),
+            "sockets": sockets,
+            "threads": process.num_threads(),
+            "children": len(process.children(recursive=True)),
+            "live_responses": sum(isinstance(o, requests.Response) for o in gc.get_objects()),
+        }
+        sample.update(_session_stats())
+        self.samples.append(sample)
+        if self.first_snapshot is None:
+            self.first_snapshot = tracemalloc.take_snapshot()
+        logger.info(
+            f"Soak iteration {iteration}: RSS {sample['rss_mb']} MB, fds {sample['fds']}, "
+            f"sockets {sample['sockets']}, children {sample['children']}, "
+            f"responses {sample['live_responses']}"
+        )
+
+    def _finished(self, iteration: int, started: float) -> bool:
+        if self.iterations and iteration >= self.iterations:
+            return True
+        return bool(self.duration and time.monotonic() - started >= self.duration)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        # Mirrors _pytest.main.pytest_runtestloop, looping over the items until the soak ends
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(f"{session.testsfailed} error(s) during collection")
+        if session.config.option.collectonly or not session.items:
+            return True
+
+        tracemalloc.start()
+        items = session.items
+        started = time.monotonic()
+        iteration = 0
+        finished = False
+        while not finished:
+            iteration += 1
+            for i, item in enumerate(items):
+                if i + 1 < len(items):
+                    nextitem = items[i + 1]
+                else:
+                    # Keep module/session fixtures alive into the next iteration
+                    finished = self._finished(iteration, started)
+                    nextitem = None if finished else items[0]
+                item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+                if session.shouldfail:
+                    raise session.Failed(session.shouldfail)
+                if session.shouldstop:
+                    raise session.Interrupted(session.shouldstop)
+            if iteration % self.sample_every == 0 or finished:
+                self.sample(iteration, time.monotonic() - started)
+
+        self.report = self.analyse(iteration, time.monotonic() - started)
+        tracemalloc.stop()
+        return True
+
+    def analyse(self, iterations: int, elapsed: float) -> dict:
+        trends, growths = {}, {}
+        for key, limit in self.thresholds.items():
+            grown = growth(self.samples, key)
+            growths[key] = grown
+            trends[key] = trend(self.samples, key)
+            if grown is not None and grown > limit:
+                self.violations.append(
+                    f"{key} grew by {grown:g} (limit {limit:g}, trend {trends[key]:+.3f}/iteration)"
+                )
+
+        top = []
+        if self.first_snapshot is not None:
+            stats = tracemalloc.take_snapshot().compare_to(self.first_snapshot, "lineno")
+            top = [str(stat) for stat in stats if stat.size_diff > 0][:TOP_ALLOCATORS]  # Growth only
+        return {
+            "iterations": iterations,
+            "elapsed_s": round(elapsed, 1),
+            "thresholds": self.thresholds,
+            "growth": growths,
+            "trend_per_iteration": trends,
+            "violations": self.violations,
+            "top_allocators": top,
+            "samples": self.samples,
+        }
+
+    def pytest_sessionfinish(self, session):
+        if self.report is None:
+            return
+        directory = os.path.dirname(self.report_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.report_path, "w") as f:
+            json.dump(self.report, f, indent=2)
+            f.write("\n")
+        if self.violations and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.report is None:
+            return
+        report = self.report
+        terminalreporter.write_sep("=", f"soak: {report['iterations']} iterations in {report['elapsed_s']}s")
+        for key, grown in report["growth"].items():
+            if grown is not None:
+                slope = report["trend_per_iteration"][key]
+                terminalreporter.write_line(f"{key:<18} growth {grown:>10g}  trend {slope:+.3f}/iteration")
+        if report["top_allocators"]:
+            terminalreporter.write_line("Top tracemalloc growth:")
+            for line in report["top_allocators"]:
+                terminalreporter.write_line(f"  {line}")
+        for violation in self.violations:
+            terminalreporter.write_line(f"LEAK: {violation}", red=True)
+        terminalreporter.write_line(f"Soak report written to {self.report_path}")
+
+
+def pytest_configure(config):
+    duration, iterations = config.getoption("soak_duration"), config.getoption("soak_iterations")
+    if duration is None and iterations is None:
+        return
+    # 0 would mean "no limit" further down and the run would never end
+    if iterations is not None and iterations <= 0:
+        raise pytest.UsageError(f"--soak-iterations must be greater than 0, got {iterations}")
+    if duration is not None:
+        parse_duration(duration)
+    if getattr(config.option, "numprocesses", None) or hasattr(config, "workerinput"):
+        raise pytest.UsageError("Soak mode runs in a single process; drop -n/--numprocesses")
+    try:
+        import psutil
+    except ImportError:
+        raise pytest.UsageError("Soak mode needs psutil: pip install psutil")
+    config.pluginmanager.register(SoakRunner(config, psutil), "soak_runner")
@@ -1,42 +1,174 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Per-subsystem overrides, e.g. LOG_LEVELS="src.base=DEBUG,src.pages=WARNING" (longest prefix wins)
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Optional structured sink: one JSON object per line, including the current test id and xdist worker
+LOG_JSON_FILE = os.getenv("LOG_JSON_FILE")
 
+CONSOLE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s (%(filename)s:%(lineno)d)"
 
-def get_logger(name: str, level: str = LOG_LEVEL) -> logging.Logger:
-    logger = logging.getLogger(name)
+_context = {"test_id": None, "worker": os.getenv("PYTEST_XDIST_WORKER", "master")}
+_queue = queue.SimpleQueue()
+_queue_handler = None
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class _ContextFilter(logging.Filter):
+    """Stamps records with the test and worker they were emitted from (runs on the caller thread)."""
+
+    def filter(self, record):
+        record.test_id = _context["test_id"]
+        record.worker = _context["worker"]
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records for the listener thread, which does the formatting and I/O.
+
+    While no listener is running (after ``shutdown_logging``) records go straight to `direct` instead,
+    so late log calls (driver teardown, atexit cleanup) are not left in a queue nobody drains."""
+
+    direct = None
+
+    def prepare(self, record):
+        # Merge args now: mutable args (dicts, lists) could change before the listener gets to them
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def emit(self, record):
+        direct = self.direct
+        if direct is not None:
+            direct.handle(record)
+        else:
+            super().emit(record)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "test_id": getattr(record, "test_id", None),
+            "worker": getattr(record, "worker", None),
+            "file": record.filename,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _parse_levels(spec: str) -> dict:
+    levels = {}
+    for part in spec.split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_subsystem_levels = _parse_levels(LOG_LEVELS)
+
+
+def _level_for(name: str, default: str) -> int:
+    matches = [prefix for prefix in _subsystem_levels if name == prefix or name.startswith(prefix + ".")]
+    level = _subsystem_levels[max(matches, key=len)] if matches else default
+    return getattr(logging, str(level).upper(), logging.INFO)  # Default to INFO if invalid level
 
-    # Check if handlers are already added to avoid duplication if called multiple times
-    if not logger.handlers:
-        logger.setLevel(getattr(logging, level, logging.INFO))  # Default to INFO if invalid level
+
+def worker_path(path: str) -> str:
+    """Inserts the xdist worker id before the extension, so each worker writes its own file."""
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if not path or not worker:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{worker}{ext}"
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # Drains everything queued so far
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def configure_logging(json_path: str = None, stream=None):
+    """(Re)starts the background listener that writes queued records to `stream` (stdout by default)
+    and, optionally, a JSON-lines file (one per xdist worker). Safe to call again, e.g. once pytest
+    options are known."""
+    global _queue_handler, _listener
+    json_path = worker_path(json_path)
+    with _setup_lock:
+        _stop_listener()
 
         # Console Handler
-        ch = logging.StreamHandler(sys.stdout)
-        ch.setLevel(level)
+        ch = logging.StreamHandler(stream or sys.stdout)
+        ch.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers = [ch]
+
+        if json_path:
+            directory = os.path.dirname(json_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fh = logging.FileHandler(json_path, mode="a", encoding="utf-8")
+            fh.setFormatter(JsonLinesFormatter())
+            handlers.append(fh)
+
+        if _queue_handler is None:
+            _queue_handler = _DeferredQueueHandler(_queue)
+            _queue_handler.addFilter(_ContextFilter())
+        _listener = logging.handlers.QueueListener(_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        _queue_handler.direct = None
+    return _queue_handler
+
+
+def shutdown_logging():
+    """Flushes queued records and stops the listener thread; later records are written to stdout directly."""
+    with _setup_lock:
+        if _queue_handler is not None and _queue_handler.direct is None:
+            # The original stdout: pytest's capture streams are closed by the time late records arrive
+            direct = logging.StreamHandler(sys.__stdout__ or sys.stdout)
+            direct.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            _queue_handler.direct = direct  # Before stopping, so nothing lands in the queue after the drain
+        _stop_listener()
+
 
-        # File Handler (optional, useful for debugging CI or long runs)
-        # log_file_path = "test_run.log"
-        # fh = logging.FileHandler(log_file_path)
-        # fh.setLevel(logging.DEBUG) # Log more details to file
+atexit.register(shutdown_logging)
 
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s (%(filename)s:%(lineno)d)"
-        )
-        ch.setFormatter(formatter)
-        # fh.setFormatter(formatter)
 
-        logger.addHandler(ch)
-        # logger.addHandler(fh)
+def set_test_context(test_id: str = None):
+    _context["test_id"] = test_id
+
+
+def get_logger(name: str, level: str = LOG_LEVEL) -> logging.Logger:
+    logger = logging.getLogger(name)
+
+    # Check if handlers are already added to avoid duplication if called multiple times
+    if not logger.handlers:
+        logger.setLevel(_level_for(name, level))
+
+        # All framework loggers share one queue handler; the caller only pays for enqueuing the record
+        if _queue_handler is None:
+            configure_logging(LOG_JSON_FILE)
+        logger.addHandler(_queue_handler)
 
         # Prevent log messages from propagating to the root logger if it has handlers
         logger.propagate = False
 
     return logger
-
-
-# Example of a root logger setup (optional, if you want a global default)
-# logging.basicConfig(level=LOG_LEVEL,
-#                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-#                     handlers=[logging.StreamHandler(sys.stdout)])
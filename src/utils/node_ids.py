@@ -0,0 +1,12 @@
+"""Helpers for pytest node ids shared by the plugins in ``src.plugins``."""
+
+import re
+
+# xdist appends '@<group>' to the node ids of tests with an xdist_group marker under --dist loadgroup.
+# Brackets are excluded so an '@' inside a parametrize id (e.g. test[user@example.com]) is left alone.
+_XDIST_GROUP_SUFFIX = re.compile(r"@[^@\[\]]*$")
+
+
+def base_nodeid(nodeid: str) -> str:
+    """Strips the '@group' suffix xdist appends to node ids under --dist loadgroup."""
+    return _XDIST_GROUP_SUFFIX.sub("", nodeid)
@@ -0,0 +1,95 @@
+"""Browser-side page performance metrics.
+
+``collect_page_metrics`` reads Navigation Timing, Paint Timing, the resource count and the JS heap size
+from the page in a single script call, and adds Chrome DevTools Protocol ``Performance.getMetrics``
+where the driver supports it. ``driver.get`` can return before the load event has finished, so the
+script waits (up to ``LOAD_WAIT_MS``) for ``loadEventEnd`` before reading the timings. Samples are kept
+per test so ``src.plugins.page_budget`` can attach them to the report and enforce
+``@pytest.mark.page_budget``.
+"""
+
+import weakref
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LOAD_WAIT_MS = 3000  # Longest wait for loadEventEnd; well under Selenium's default 30s script timeout
+
+# Asynchronous script: arguments[0] is the wait in ms, the last argument is Selenium's callback
+PAGE_METRICS_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + arguments[0];
+const collect = () => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paint = {};
+    performance.getEntriesByType('paint').forEach(p => { paint[p.name] = p.startTime; });
+    const since = (end) => (nav && end > 0) ? Math.round(end - nav.startTime) : null;
+    return {
+        url: location.href,
+        load_ms: nav ? since(nav.loadEventEnd) : null,
+        dom_content_loaded_ms: nav ? since(nav.domContentLoadedEventEnd) : null,
+        ttfb_ms: nav ? Math.round(nav.responseStart - nav.requestStart) : null,
+        transfer_bytes: nav ? nav.transferSize : null,
+        first_paint_ms: paint['first-paint'] !== undefined ? Math.round(paint['first-paint']) : null,
+        first_contentful_paint_ms: paint['first-contentful-paint'] !== undefined
+            ? Math.round(paint['first-contentful-paint']) : null,
+        resources: performance.getEntriesByType('resource').length,
+        js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null
+    };
+};
+(function poll() {
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (!nav || nav.loadEventEnd > 0 || Date.now() >= deadline) {
+        done(collect());
+    } else {
+        setTimeout(poll, 25);
+    }
+})();
+"""
+
+CDP_METRICS = ("JSHeapUsedSize", "JSHeapTotalSize", "Nodes", "Documents", "LayoutCount", "ScriptDuration")
+
+_samples = []
+_cdp_enabled = weakref.WeakSet()  # Drivers with the CDP Performance domain enabled
+
+
+def _cdp_metrics(driver) -> dict:
+    if not hasattr(driver, "execute_cdp_cmd"):  # Only Chromium-based drivers speak CDP
+        return {}
+    try:
+        if driver not in _cdp_enabled:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            _cdp_enabled.add(driver)
+        result = driver.execute_cdp_cmd("Performance.getMetrics", {})
+    except Exception as e:
+        logger.debug("CDP performance metrics unavailable: %s", e)
+        return {}
+    return {m["name"]: m["value"] for m in result.get("metrics", []) if m["name"] in CDP_METRICS}
+
+
+def collect_page_metrics(driver, label: str = None) -> dict:
+    """Reads the current page's performance metrics and records them for the running test."""
+    try:
+        metrics = driver.execute_async_script(PAGE_METRICS_SCRIPT, LOAD_WAIT_MS) or {}
+    except Exception as e:
+        logger.warning(f"Could not collect page metrics: {e}")
+        return {}
+    cdp = _cdp_metrics(driver)
+    if cdp:
+        metrics["cdp"] = cdp
+        if metrics.get("js_heap_bytes") is None:
+            metrics["js_heap_bytes"] = cdp.get("JSHeapUsedSize")
+    metrics["label"] = label
+    logger.info(
+        f"Page metrics for {metrics.get('url')}: load {metrics.get('load_ms')} ms, "
+        f"FCP {metrics.get('first_contentful_paint_ms')} ms, {metrics.get('resources')} resources"
+    )
+    _samples.append(metrics)
+    return metrics
+
+
+def drain_page_metrics() -> list:
+    samples = list(_samples)
+    _samples.clear()
+    return samples
@@ -0,0 +1,37 @@
+"""Lightweight per-call timing for client and page-object methods.
+
+Decorate a method with ``@timed()`` to record how long each call takes under the name
+``<Class>.<method>``. Timings are kept per test so ``src.plugins.perf_budget`` can compare them
+against budgets and stored baselines.
+"""
+
+import functools
+import time
+
+_timings = []
+
+
+def record_timing(name: str, seconds: float):
+    _timings.append((name, seconds))
+
+
+def drain_timings() -> list:
+    """Returns and clears the (name, seconds) pairs recorded since the last drain."""
+    timings = list(_timings)
+    _timings.clear()
+    return timings
+
+
+def timed(name: str = None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                record_timing(name or f"{type(self).__name__}.{func.__name__}", time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
@@ -62,6 +62,7 @@ class TestBookingAPI:
         logger.info("test_health_check successful.")
 
     @pytest.mark.smoke
+    @pytest.mark.perf_budget(test_ms=5000, calls={"BookingService.create_booking": 3000})
     def test_create_booking(self, booking_service_client):
         logger.info("Starting test_create_booking")
         booking_payload = {
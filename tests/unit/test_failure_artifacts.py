@@ -0,0 +1,119 @@
+# tests/unit/test_failure_artifacts.py
+import base64
+import gzip
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pytest
+
+from src.plugins import failure_artifacts
+from src.plugins.failure_artifacts import (
+    DEFAULT_SETTINGS,
+    FailureArtifactCollector,
+    grab_raw,
+    write_artifacts,
+)
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+
+
+def settings(**overrides):
+    return {**DEFAULT_SETTINGS, **overrides}
+
+
+class FakeDriver:
+    page_source = "<html><body>Epic sadface</body></html>"
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(PNG).decode()
+
+    def get_log(self, kind):
+        raise NotImplementedError("get_log is not supported by this driver")
+
+
+@pytest.mark.unit
+class TestGrabRaw:
+
+    def test_skips_data_the_driver_cannot_provide(self):
+        raw = grab_raw(FakeDriver())
+        assert raw == {"screenshot": base64.b64encode(PNG).decode(), "page_source": FakeDriver.page_source}
+
+
+@pytest.mark.unit
+class TestWriteArtifacts:
+
+    def test_writes_every_artifact(self, tmp_path):
+        raw = {
+            "screenshot": base64.b64encode(PNG).decode(),
+            "page_source": "<html>ok</html>",
+            "console": [{"timestamp": 1, "level": "SEVERE", "message": "Uncaught TypeError"}],
+        }
+        written = dict(write_artifacts(raw, str(tmp_path / "call"), settings()))
+        assert sorted(written) == ["console.log", "page_source.html", "screenshot.png"]
+        assert (tmp_path / "call" / "screenshot.png").read_bytes() == PNG
+        assert (tmp_path / "call" / "console.log").read_text() == "1 SEVERE Uncaught TypeError"
+
+    def test_oversized_screenshot_is_not_saved(self, tmp_path):
+        raw = {"screenshot": base64.b64encode(PNG).decode()}
+        assert write_artifacts(raw, str(tmp_path), settings(max_screenshot_bytes=len(PNG) - 1)) == []
+        assert not (tmp_path / "screenshot.png").exists()
+
+    def test_long_page_source_is_truncated_with_full_gzipped_copy(self, tmp_path):
+        source = "<html>" + "x" * 500 + "</html>"
+        written = dict(
+            write_artifacts({"page_source": source}, str(tmp_path), settings(max_page_source_bytes=100))
+        )
+        assert sorted(written) == ["page_source.full.html.gz", "page_source.html"]
+        truncated = (tmp_path / "page_source.html").read_bytes()
+        assert truncated.startswith(source[:100].encode())
+        assert truncated.endswith(b"<!-- truncated, see page_source.full.html.gz -->")
+        assert gzip.decompress((tmp_path / "page_source.full.html.gz").read_bytes()) == source.encode()
+
+    def test_short_page_source_is_not_compressed(self, tmp_path):
+        written = dict(write_artifacts({"page_source": "<html></html>"}, str(tmp_path), settings()))
+        assert list(written) == ["page_source.html"]
+
+    def test_console_keeps_latest_entries(self, tmp_path):
+        entries = [{"timestamp": i, "level": "INFO", "message": f"entry {i}"} for i in range(5)]
+        write_artifacts({"console": entries}, str(tmp_path), settings(max_console_entries=2))
+        assert (tmp_path / "console.log").read_text().splitlines() == [
+            "... 3 earlier entries dropped",
+            "3 INFO entry 3",
+            "4 INFO entry 4",
+        ]
+
+
+@pytest.mark.unit
+class TestAttach:
+
+    @pytest.fixture
+    def attached(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            failure_artifacts.allure.attach, "file", lambda path, name, attachment_type: calls.append(name)
+        )
+        return calls
+
+    def test_attaches_finished_artifacts(self, attached):
+        collector = FailureArtifactCollector()
+        future = Future()
+        future.set_result([("screenshot.png", "a.png"), ("page_source.full.html.gz", "a.html.gz")])
+        collector.pending["test_login"] = [(future, "call", 1.0)]
+        collector.attach(SimpleNamespace(nodeid="test_login"))
+        assert attached == ["screenshot.png (call)"]  # The gzipped copy stays on disk only
+        assert collector.pending == {}
+
+    def test_timed_out_artifacts_are_left_on_disk(self, attached):
+        collector = FailureArtifactCollector()
+        collector.pending["test_login"] = [(Future(), "setup", 0.01)]  # Never completes
+        collector.attach(SimpleNamespace(nodeid="test_login"))
+        assert attached == []
+        assert collector.pending == {}
+
+    def test_failed_write_is_not_attached(self, attached):
+        collector = FailureArtifactCollector()
+        future = Future()
+        future.set_exception(OSError("disk full"))
+        collector.pending["test_login"] = [(future, "call", 1.0)]
+        collector.attach(SimpleNamespace(nodeid="test_login"))
+        assert attached == []
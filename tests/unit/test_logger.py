@@ -0,0 +1,124 @@
+# tests/unit/test_logger.py
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from src.utils import logger as log_module
+from src.utils.logger import (
+    JsonLinesFormatter,
+    _DeferredQueueHandler,
+    _level_for,
+    _parse_levels,
+    configure_logging,
+    get_logger,
+    shutdown_logging,
+    worker_path,
+)
+
+
+def make_record(msg="Booking %s created", args=(42,), exc_info=None):
+    return logging.LogRecord(
+        "src.api_clients.booking_service", logging.INFO, "booking_service.py", 30, msg, args, exc_info
+    )
+
+
+@pytest.fixture
+def restore_logging(pytestconfig):
+    yield
+    configure_logging(pytestconfig.getoption("log_json"))  # As src.plugins.log_context set it up
+
+
+@pytest.mark.unit
+class TestLevels:
+
+    def test_parse_levels(self):
+        assert _parse_levels("src.base=debug, src.pages=WARNING,broken,=INFO,src.utils=") == {
+            "src.base": "DEBUG",
+            "src.pages": "WARNING",
+        }
+
+    def test_longest_prefix_wins(self, monkeypatch):
+        monkeypatch.setattr(log_module, "_subsystem_levels", _parse_levels("src=WARNING,src.base=DEBUG"))
+        assert _level_for("src.base.api_base", "INFO") == logging.DEBUG
+        assert _level_for("src.base", "INFO") == logging.DEBUG
+        assert _level_for("src.pages.login_page", "INFO") == logging.WARNING
+        assert _level_for("src_other", "INFO") == logging.INFO  # Prefixes match whole name segments
+        assert _level_for("tests.api", "ERROR") == logging.ERROR
+
+    def test_invalid_level_falls_back_to_info(self, monkeypatch):
+        monkeypatch.setattr(log_module, "_subsystem_levels", {"src.base": "LOUD"})
+        assert _level_for("src.base.api_base", "DEBUG") == logging.INFO
+        assert _level_for("src.pages", "NOISY") == logging.INFO
+
+
+@pytest.mark.unit
+class TestWorkerPath:
+
+    def test_without_xdist(self, monkeypatch):
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        assert worker_path("reports/logs.jsonl") == "reports/logs.jsonl"
+
+    def test_with_xdist_worker(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        assert worker_path("reports/logs.jsonl") == "reports/logs.gw1.jsonl"
+        assert worker_path("logs") == "logs.gw1"
+        assert worker_path(None) is None
+
+    def test_each_worker_writes_its_own_json_file(self, monkeypatch, tmp_path, restore_logging):
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+        monkeypatch.setitem(log_module._context, "worker", "gw1")
+        configure_logging(str(tmp_path / "logs.jsonl"))
+        get_logger("tests.unit.test_logger").info("from worker")
+        shutdown_logging()  # Flushes the listener
+        assert [path.name for path in tmp_path.iterdir()] == ["logs.gw1.jsonl"]
+        entry = json.loads((tmp_path / "logs.gw1.jsonl").read_text().splitlines()[-1])
+        assert (entry["message"], entry["worker"]) == ("from worker", "gw1")
+
+
+@pytest.mark.unit
+class TestJsonLinesFormatter:
+
+    def test_includes_test_context(self):
+        record = make_record()
+        record.test_id = "tests/api/test_booking_api.py::TestBookingAPI::test_create_booking"
+        record.worker = "gw0"
+        entry = json.loads(JsonLinesFormatter().format(record))
+        assert entry["message"] == "Booking 42 created"
+        assert entry["test_id"] == record.test_id
+        assert entry["worker"] == "gw0"
+        assert (entry["level"], entry["logger"], entry["line"]) == (
+            "INFO",
+            "src.api_clients.booking_service",
+            30,
+        )
+        assert "exception" not in entry
+
+    def test_includes_exception(self):
+        try:
+            raise ValueError("bad payload")
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+        entry = json.loads(JsonLinesFormatter().format(record))
+        assert entry["test_id"] is None and entry["worker"] is None
+        assert "ValueError: bad payload" in entry["exception"]
+
+
+@pytest.mark.unit
+class TestQueueHandler:
+
+    def test_prepare_merges_args_on_the_calling_thread(self):
+        records = queue.SimpleQueue()
+        payload = {"firstname": "Jim"}
+        _DeferredQueueHandler(records).handle(make_record("Payload: %s", (payload,)))
+        payload["firstname"] = "Changed"
+        record = records.get_nowait()
+        assert (record.getMessage(), record.args) == ("Payload: {'firstname': 'Jim'}", None)
+
+    def test_records_after_shutdown_are_written_directly(self, capfd, restore_logging):
+        logger = get_logger("tests.unit.test_logger")
+        shutdown_logging()
+        logger.warning("late record from %s", "driver teardown")
+        assert "late record from driver teardown" in capfd.readouterr().out
@@ -0,0 +1,27 @@
+# tests/unit/test_node_ids.py
+import pytest
+
+from src.utils.node_ids import base_nodeid
+
+
+@pytest.mark.unit
+class TestBaseNodeid:
+
+    @pytest.mark.parametrize(
+        "nodeid, expected",
+        [
+            ("tests/api/test_booking_api.py::TestBookingAPI::test_health_check", None),
+            (
+                "tests/api/test_booking_api.py::TestBookingAPI::test_health_check"
+                "@sched-booking_service_client:tests/api/test_booking_api.py",
+                "tests/api/test_booking_api.py::TestBookingAPI::test_health_check",
+            ),
+            ("tests/web/test_login.py::test_login[user@example.com]", None),
+            (
+                "tests/web/test_login.py::test_login[user@example.com]@browsers",
+                "tests/web/test_login.py::test_login[user@example.com]",
+            ),
+        ],
+    )
+    def test_strips_xdist_group_suffix(self, nodeid, expected):
+        assert base_nodeid(nodeid) == (expected or nodeid)
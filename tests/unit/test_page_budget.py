@@ -0,0 +1,34 @@
+# tests/unit/test_page_budget.py
+import pytest
+
+from src.plugins.page_budget import check_budget, missing_metrics
+
+SAMPLE = {
+    "label": "LoginPage",
+    "url": "https://www.saucedemo.com/",
+    "load_ms": 1200,
+    "first_contentful_paint_ms": None,
+    "resources": 40,
+    "js_heap_bytes": 8 * 1024 * 1024,
+}
+
+
+@pytest.mark.unit
+class TestPageBudget:
+
+    def test_within_budget(self):
+        assert check_budget([SAMPLE], {"load_ms": 3000, "resources": 60, "js_heap_mb": 10}) == []
+
+    def test_over_budget(self):
+        violations = check_budget([SAMPLE], {"load_ms": 1000, "js_heap_mb": 5})
+        assert violations == [
+            "LoginPage (https://www.saucedemo.com/): load_ms=1200 > 1000",
+            "LoginPage (https://www.saucedemo.com/): js_heap_mb=8 > 5",
+        ]
+
+    def test_unreported_metric_is_missing_not_a_violation(self):
+        budget = {"load_ms": 3000, "first_contentful_paint_ms": 100}
+        assert check_budget([SAMPLE], budget) == []
+        assert missing_metrics([SAMPLE], budget) == [
+            "LoginPage (https://www.saucedemo.com/): first_contentful_paint_ms"
+        ]
@@ -0,0 +1,69 @@
+# tests/unit/test_perf_budget.py
+import pytest
+
+from src.plugins.perf_budget import (
+    MIN_REGRESSION_MS,
+    TEST_KEY,
+    check_samples,
+    marker_error,
+    regression_threshold,
+)
+
+
+@pytest.mark.unit
+class TestRegressionThreshold:
+
+    def test_tolerance_dominates_for_stable_history(self):
+        assert regression_threshold([1000, 1000, 1000], 0.5) == 1500
+
+    def test_mad_dominates_for_noisy_history(self):
+        history = [100, 200, 300, 400, 500]
+        assert regression_threshold(history, 0.1) == pytest.approx(300 + 3 * 1.4826 * 100)
+
+    def test_never_tighter_than_min_regression(self):
+        assert regression_threshold([5, 5, 5], 0.5) == 5 + MIN_REGRESSION_MS
+
+
+@pytest.mark.unit
+class TestCheckSamples:
+
+    def test_within_budget_and_baseline(self):
+        samples = {TEST_KEY: 900, "BookingService.create_booking": 400}
+        baseline = {TEST_KEY: [1000, 1000], "BookingService.create_booking": [400, 420]}
+        budget = {"test_ms": 2000, "calls": {"BookingService.create_booking": 800}}
+        assert check_samples(samples, baseline, budget) == []
+
+    def test_absolute_budget_violations(self):
+        samples = {TEST_KEY: 2500, "BookingService.create_booking": 900}
+        budget = {"test_ms": 2000, "calls": {"BookingService.create_booking": 800}}
+        assert check_samples(samples, {}, budget) == [
+            "test body: 2500 ms exceeds budget of 2000 ms",
+            "BookingService.create_booking: 900 ms exceeds budget of 800 ms",
+        ]
+
+    def test_regression_against_baseline_uses_tolerance(self):
+        baseline = {TEST_KEY: [1000, 1000, 1000]}
+        assert check_samples({TEST_KEY: 1400}, baseline, {}) == []
+        assert check_samples({TEST_KEY: 1400}, baseline, {"tolerance": 0.2}) == [
+            "test body: 1400 ms regressed against baseline median 1000 ms (threshold 1200 ms)"
+        ]
+
+    def test_calls_without_budget_or_baseline_are_not_checked(self):
+        assert check_samples({"LoginPage.login": 10_000}, {}, {}) == []
+
+
+@pytest.mark.unit
+class TestMarkerError:
+
+    def test_valid_marker(self):
+        assert (
+            marker_error((), {"test_ms": 2000, "calls": {"LoginPage.login": 5000}, "tolerance": 0.3}) is None
+        )
+
+    def test_rejects_misspelled_keys(self):
+        error = marker_error((), {"test_mss": 2000, "tolerance": 0.3})
+        assert "unknown keys ['test_mss']" in error
+
+    def test_rejects_positional_arguments(self):
+        error = marker_error((2000,), {})
+        assert "positional arguments (2000,)" in error and "unknown keys" not in error
@@ -0,0 +1,259 @@
+# tests/unit/test_resilience.py
+import time as real_time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+from src.base import resilience
+from src.base.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+    RetryBudget,
+    TokenBucket,
+    parse_retry_after,
+)
+
+URL = "http://booker.test/booking/1"
+
+
+class FakeClock:
+    """Stands in for the `time` module inside resilience.py; sleeping only advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return real_time.time() + self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience, "time", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_state(monkeypatch):
+    # Own event list too: these fake events must not reach the resilience report of the real run
+    monkeypatch.setattr(resilience, "_hosts", {})
+    monkeypatch.setattr(resilience, "_budgets", {})
+    monkeypatch.setattr(resilience, "_events", [])
+
+
+def event_kinds():
+    return [event["kind"] for event in resilience.drain_events()]
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"{}"
+    response._content_consumed = True
+    response.headers.update(headers or {})
+    response.url = URL
+    return response
+
+
+class FakeSend:
+    """Returns (or raises) the given outcomes in order, like the transport behind APIBase would."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return make_response(*outcome) if isinstance(outcome, tuple) else make_response(outcome)
+
+
+def make_resilience(**overrides):
+    settings = {
+        "rate_limit": {"enabled": False},
+        "retry": {"backoff_base": 0.0},
+        "circuit_breaker": {"failure_threshold": 3, "reset_timeout": 30.0},
+    }
+    for section, values in overrides.items():
+        settings[section].update(values)
+    return Resilience({"resilience": settings})
+
+
+@pytest.mark.unit
+class TestParseRetryAfter:
+
+    @pytest.mark.parametrize("value, expected", [("120", 120.0), ("0", 0.0), ("-5", 0.0), ("1.5", 1.5)])
+    def test_delta_seconds(self, value, expected):
+        assert parse_retry_after(value) == expected
+
+    def test_http_date(self):
+        seconds = parse_retry_after(formatdate(real_time.time() + 60, usegmt=True))
+        assert 55 <= seconds <= 61
+
+    @pytest.mark.parametrize("value", [None, "", "soon"])
+    def test_missing_or_invalid(self, value):
+        assert parse_retry_after(value) is None
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+
+    def test_burst_is_free_then_waits_for_refill(self, clock):
+        bucket = TokenBucket(rate=2, burst=3)
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire() == pytest.approx(0.5)
+
+    def test_pause_blocks_until_it_ends(self, clock):
+        bucket = TokenBucket(rate=100, burst=1)
+        bucket.pause(5)
+        assert bucket.acquire() == pytest.approx(5.0)
+
+    def test_adaptive_rate_halves_on_throttle_and_grows_on_success(self, clock):
+        bucket = TokenBucket(rate=10, burst=1, adaptive=True, min_rate=1, max_rate=11)
+        bucket.on_response(429, latency=0.1)
+        assert bucket.rate == 5
+        bucket.on_response(200, latency=5.0)  # Slower than latency_target
+        assert bucket.rate == pytest.approx(4.5)
+        for _ in range(20):
+            bucket.on_response(200, latency=0.1)
+        assert bucket.rate == 11
+
+    def test_adaptive_rate_never_drops_below_min_rate(self, clock):
+        bucket = TokenBucket(rate=2, burst=1, adaptive=True, min_rate=1)
+        for _ in range(5):
+            bucket.on_response(503, latency=0.1)
+        assert bucket.rate == 1
+
+
+@pytest.mark.unit
+class TestRetryBudget:
+
+    def test_exhausts_and_refills_over_time(self, clock):
+        budget = RetryBudget(ratio=0.2, min_per_second=1.0)
+        assert sum(budget.withdraw() for _ in range(20)) == 10
+        clock.sleep(2)
+        assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+
+    def test_deposits_add_a_fraction_of_a_retry_per_request(self, clock):
+        budget = RetryBudget(ratio=0.5, min_per_second=0.0)
+        while budget.withdraw():
+            pass
+        budget.deposit()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert budget.withdraw()
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+
+    def test_opens_after_consecutive_failures(self, clock):
+        breaker = CircuitBreaker("booker.test", failure_threshold=3, reset_timeout=30)
+        for _ in range(2):
+            breaker.record_failure()
+        breaker.record_success()  # Resets the streak
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+        assert event_kinds() == ["circuit-open"]
+
+    def test_half_open_trial_closes_or_reopens(self, clock):
+        breaker = CircuitBreaker("booker.test", failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        clock.sleep(30)
+        assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow()  # Only one trial request at a time
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        clock.sleep(30)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+        assert event_kinds() == ["circuit-open", "circuit-open", "circuit-close"]
+
+
+@pytest.mark.unit
+class TestResilienceExecute:
+
+    def test_retries_idempotent_request_on_gateway_error(self, clock):
+        send = FakeSend(503, 502, 200)
+        assert make_resilience().execute("GET", URL, send).status_code == 200
+        assert send.calls == 3
+        assert event_kinds() == ["retry", "retry"]
+
+    def test_does_not_retry_non_idempotent_request(self, clock):
+        send = FakeSend(503, 200)
+        assert make_resilience().execute("POST", URL, send).status_code == 503
+        assert send.calls == 1
+
+    def test_retries_connection_errors_then_raises(self, clock):
+        send = FakeSend(requests.exceptions.ConnectionError("refused"))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            make_resilience(circuit_breaker={"enabled": False}).execute("GET", URL, send)
+        assert send.calls == 4  # First attempt plus max_retries
+        assert event_kinds() == ["retry", "retry", "retry"]
+
+    def test_stops_retrying_when_budget_is_exhausted(self, clock):
+        guard = make_resilience(circuit_breaker={"enabled": False})
+        while guard.budget.withdraw():
+            pass
+        send = FakeSend(503, 200)
+        assert guard.execute("GET", URL, send).status_code == 503
+        assert send.calls == 1
+        assert event_kinds() == ["retry-budget"]
+
+    def test_honours_short_retry_after(self, clock):
+        send = FakeSend((503, {"Retry-After": "3"}), 200)
+        assert make_resilience().execute("GET", URL, send).status_code == 200
+        assert clock.sleeps == [3.0]
+        assert event_kinds() == ["retry"]
+
+    def test_long_retry_after_is_not_waited_for(self, clock):
+        guard = make_resilience(rate_limit={"enabled": True, "adaptive": False})
+        send = FakeSend((503, {"Retry-After": "3600"}), 200)
+        assert guard.execute("GET", URL, send).status_code == 503
+        assert send.calls == 1
+        assert event_kinds() == ["throttle", "retry-after"]
+        limiter, _ = guard._host_guards("booker.test")
+        assert limiter.acquire() <= guard.settings["retry"]["max_retry_after"]
+
+    def test_server_errors_do_not_open_the_breaker(self, clock):
+        guard = make_resilience()
+        for _ in range(5):
+            assert guard.execute("POST", URL, FakeSend(500)).status_code == 500
+        assert guard.execute("GET", URL, FakeSend(200)).status_code == 200
+        assert event_kinds() == []
+
+    def test_gateway_errors_open_the_breaker(self, clock):
+        guard = make_resilience(retry={"enabled": False})
+        for _ in range(3):
+            guard.execute("GET", URL, FakeSend(503))
+        send = FakeSend(200)
+        with pytest.raises(CircuitOpenError):
+            guard.execute("GET", URL, send)
+        assert send.calls == 0
+        assert event_kinds() == ["circuit-open", "circuit-reject"]
+        clock.sleep(30)
+        guard.execute("GET", URL, send)
+        assert event_kinds() == ["circuit-close"]
+
+    def test_clients_with_different_settings_do_not_share_guards(self, clock):
+        strict = make_resilience(circuit_breaker={"failure_threshold": 1})
+        lenient = make_resilience(circuit_breaker={"failure_threshold": 10})
+        assert strict._host_guards("booker.test") is not lenient._host_guards("booker.test")
+        assert make_resilience()._host_guards("booker.test") is make_resilience()._host_guards("booker.test")
+        assert strict.budget is lenient.budget
@@ -0,0 +1,81 @@
+# tests/unit/test_scheduler.py
+import json
+
+import pytest
+
+from src.plugins.scheduler import DurationScheduler, DurationStore, parse_shard, shard_path
+
+
+@pytest.mark.unit
+class TestParseShard:
+
+    @pytest.mark.parametrize("value, expected", [("1/3", (1, 3)), (" 3 / 3 ", (3, 3)), ("1/1", (1, 1))])
+    def test_valid(self, value, expected):
+        assert parse_shard(value) == expected
+
+    @pytest.mark.parametrize("value", ["", "3", "0/3", "4/3", "1/0", "a/b", "-1/3"])
+    def test_invalid(self, value):
+        with pytest.raises(pytest.UsageError):
+            parse_shard(value)
+
+    def test_shard_path(self):
+        assert shard_path(".test_durations.json", 2, 3) == ".test_durations.shard-2-of-3.json"
+        assert shard_path("ci/durations", 1, 2) == "ci/durations.shard-1-of-2.json"
+
+
+@pytest.mark.unit
+class TestAssignShards:
+
+    def test_balances_longest_first(self):
+        units = [(cost, index, [f"t{index}"]) for index, cost in enumerate([8, 7, 6, 5, 4])]
+        shards, loads = DurationScheduler.assign_shards(units, 2)
+        assert loads == [17, 13]  # LPT: 8+5+4 and 7+6
+        assert [[unit[1] for unit in shard] for shard in shards] == [[0, 3, 4], [1, 2]]
+
+    def test_every_unit_lands_in_exactly_one_shard(self):
+        units = [(1.0, index, [f"t{index}"]) for index in range(7)]
+        shards, loads = DurationScheduler.assign_shards(units, 3)
+        assert sorted(unit[1] for shard in shards for unit in shard) == list(range(7))
+        assert sorted(loads) == [2.0, 2.0, 3.0]
+
+    def test_ties_keep_collection_order(self):
+        units = [(1.0, index, [f"t{index}"]) for index in range(4)]
+        shards, _ = DurationScheduler.assign_shards(units, 2)
+        assert [[unit[1] for unit in shard] for shard in shards] == [[0, 2], [1, 3]]
+
+    def test_more_shards_than_units(self):
+        shards, loads = DurationScheduler.assign_shards([(3.0, 0, ["t0"])], 3)
+        assert [len(shard) for shard in shards] == [1, 0, 0]
+        assert loads == [3.0, 0.0, 0.0]
+
+
+@pytest.mark.unit
+class TestDurationStore:
+
+    def test_update_smooths_known_and_adds_new_durations(self, tmp_path):
+        store = DurationStore(str(tmp_path / "durations.json"))
+        store.durations = {"a": 10.0, "b": 2.0}
+        updated = store.update({"a": 20.0, "c": 3.0})
+        assert updated == {"a": 15.0, "c": 3.0}
+        assert store.durations == {"a": 15.0, "b": 2.0, "c": 3.0}
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        path = tmp_path / "nested" / "durations.json"
+        store = DurationStore(str(path))
+        store.update({"b": 1.5, "a": 2.0})
+        store.save()
+        assert list(json.loads(path.read_text())) == ["a", "b"]
+        assert DurationStore(str(path)).load().durations == {"a": 2.0, "b": 1.5}
+
+    def test_save_subset_elsewhere(self, tmp_path):
+        store = DurationStore(str(tmp_path / "durations.json"))
+        store.durations = {"a": 1.0, "b": 2.0}
+        store.save({"b": 2.0}, str(tmp_path / "shard.json"))
+        assert json.loads((tmp_path / "shard.json").read_text()) == {"b": 2.0}
+        assert not (tmp_path / "durations.json").exists()
+
+    @pytest.mark.parametrize("content", ["not json", "[1, 2]", '{"a": "slow"}'])
+    def test_unreadable_file_is_ignored(self, tmp_path, content):
+        path = tmp_path / "durations.json"
+        path.write_text(content)
+        assert DurationStore(str(path)).load().durations == {}
@@ -0,0 +1,64 @@
+# tests/unit/test_soak.py
+from types import SimpleNamespace
+
+import pytest
+
+from src.plugins import soak
+from src.plugins.soak import DEFAULT_MAX_GROWTH, growth, parse_duration, parse_thresholds, trend
+
+
+def samples(key, values):
+    return [{"iteration": i + 1, key: value} for i, value in enumerate(values)]
+
+
+@pytest.mark.unit
+class TestParseDuration:
+
+    @pytest.mark.parametrize(
+        "value, expected", [("90", 90), ("90s", 90), ("30m", 1800), ("2h", 7200), ("1.5h", 5400)]
+    )
+    def test_valid(self, value, expected):
+        assert parse_duration(value) == expected
+
+    @pytest.mark.parametrize("value", ["", "2d", "h", "-5m", "10 minutes", "0", "0m", "0.0h"])
+    def test_invalid(self, value):
+        with pytest.raises(pytest.UsageError):
+            parse_duration(value)
+
+    @pytest.mark.parametrize(
+        "options", [{"soak_iterations": 0}, {"soak_iterations": -1}, {"soak_duration": "0"}]
+    )
+    def test_non_positive_limits_are_rejected(self, options):
+        options = {"soak_duration": None, "soak_iterations": None, **options}
+        config = SimpleNamespace(getoption=options.get)
+        with pytest.raises(pytest.UsageError, match="greater than 0"):
+            soak.pytest_configure(config)
+
+    def test_threshold_overrides(self):
+        thresholds = parse_thresholds(["rss_mb=150", "fds=5.5"])
+        assert thresholds == {**DEFAULT_MAX_GROWTH, "rss_mb": 150.0, "fds": 5.5}
+        with pytest.raises(pytest.UsageError):
+            parse_thresholds(["heap=1"])
+        with pytest.raises(pytest.UsageError):
+            parse_thresholds(["rss_mb=lots"])
+
+
+@pytest.mark.unit
+class TestGrowthAndTrend:
+
+    def test_growth_compares_medians_of_both_ends(self):
+        # A single spike at either end does not count as growth
+        assert growth(samples("fds", [10, 40, 10, 10, 10, 10, 11, 10]), "fds") == 0
+        assert growth(samples("fds", [10, 10, 10, 20, 30, 40, 50, 60]), "fds") == 40
+
+    def test_growth_needs_two_samples(self):
+        assert growth(samples("fds", [10]), "fds") is None
+        assert growth(samples("fds", [10, 15]), "fds") == 5
+
+    def test_growth_skips_missing_values(self):
+        assert growth(samples("sockets", [None, 2, None, 6]), "sockets") == 4
+
+    def test_trend_is_the_slope_per_iteration(self):
+        assert trend(samples("rss_mb", [100, 102, 104, 106]), "rss_mb") == pytest.approx(2.0)
+        assert trend(samples("rss_mb", [100, 100, 100]), "rss_mb") == 0.0
+        assert trend(samples("rss_mb", [100]), "rss_mb") == 0.0
@@ -9,6 +9,7 @@ logger = get_logger(__name__)
 
 @pytest.mark.web
 @pytest.mark.smoke
+@pytest.mark.page_budget(load_ms=10000, first_contentful_paint_ms=5000)  # Generous; catches gross regressions
 class TestLogin:
     @pytest.fixture(autouse=True)
     def setup_pages(self, web_driver, config):
@@ -17,6 +18,7 @@ class TestLogin:
         # Navigate to login page before each test in this class
         self.login_page.navigate_to_url(config.get("login_path", "/"))  # SauceDemo login is at root
 
+    @pytest.mark.perf_budget(calls={"LoginPage.login": 5000})
     def test_successful_login(self, config):
         logger.info("Starting test_successful_login for SauceDemo")
         user_creds = config["credentials"].get("standard_user")